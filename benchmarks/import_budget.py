@@ -0,0 +1,64 @@
+"""Checks what the CLI imports at start-up, so the device stack stays lazy.
+
+Runs each entry point under `python -X importtime` and fails if it loads a module on
+the forbidden list or if its total import time exceeds the budget:
+
+    python benchmarks/import_budget.py --budget-ms 80
+"""
+import argparse
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Entry points and the modules each one must not import.
+CHECKS: Dict[str, Tuple[List[str], Tuple[str, ...]]] = {
+    "import zoneout": (
+        ["-c", "import zoneout"],
+        ("hid", "asyncio", "zoneout.device", "zoneout.decoders", "zoneout.aio", "zoneout.reactor"),
+    ),
+    "zoneout --help": (
+        ["-m", "zoneout.cli", "--help"],
+        ("hid", "asyncio", "zoneout.device", "zoneout.decoders", "zoneout.aio", "zoneout.client",
+         "zoneout.simulator", "zoneout.models", "concurrent.futures"),
+    ),
+}
+
+
+def import_times(args: List[str]) -> Tuple[Dict[str, int], int]:
+    """Per-module cumulative import time in microseconds, and the total."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", *args],
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    times: Dict[str, int] = {}
+    total = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = len(name) - len(name.lstrip())
+        times[name.strip()] = int(cumulative)
+        if depth == 1:
+            total += int(cumulative)
+    return times, total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--budget-ms', type=float, default=80.0, help="Maximum total import time per check.")
+    parser.add_argument('--runs', type=int, default=5, help="Runs per check; the fastest one is used.")
+    args = parser.parse_args()
+
+    failed = False
+    for label, (cmd, forbidden) in CHECKS.items():
+        runs = [import_times(cmd) for _ in range(args.runs)]
+        times, total = min(runs, key=lambda run: run[1])
+        loaded = [name for name in forbidden if name in times]
+        ok = not loaded and total / 1000 <= args.budget_ms
+        failed |= not ok
+        print(f"{label:<16} {total / 1000:>7.1f} ms  {'ok' if ok else 'FAIL'}")
+        for name in loaded:
+            print(f"  imports {name} ({times[name] / 1000:.1f} ms)")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
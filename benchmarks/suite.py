@@ -0,0 +1,262 @@
+"""Benchmark suite for zoneout, run against the simulated headset (no hardware needed).
+
+Writes machine-readable results so runs can be compared between commits:
+
+    python benchmarks/suite.py --json before.json
+    python benchmarks/suite.py --json after.json --compare before.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from itertools import islice
+from typing import Any, Callable, Dict, List, Optional
+
+from zoneout import protocol
+from zoneout.decoders import decode_report
+from zoneout.device import ZoneHeadset, _encode_settings
+from zoneout.group import HeadsetGroup
+from zoneout.simulator import SimulatedHeadset
+
+
+RTTS_MS = (0.0, 0.5, 1.0, 2.0)
+
+
+def _rate(fn: Callable[[], Any], number: int, repeat: int = 5) -> float:
+    """Best-of-`repeat` calls per second."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return number / best
+
+
+def _median_ms(fn: Callable[[], Any], number: int) -> float:
+    samples = []
+    for _ in range(number):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1e3
+
+
+class _EventFeed:
+    """Transport that returns a fixed cycle of event packets as fast as they are read."""
+
+    def __init__(self, packets: List[bytes]) -> None:
+        self._packets = packets
+        self._i = 0
+
+    def open(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def set_nonblocking(self, enabled: int) -> None:
+        pass
+
+    def write(self, data: Any) -> int:
+        return len(data)
+
+    def read(self, size: int, timeout_ms: int = 0) -> bytes:
+        packet = self._packets[self._i]
+        self._i = (self._i + 1) % len(self._packets)
+        return packet
+
+
+def bench_encode(quick: bool) -> Dict[str, float]:
+    buffers: Dict[str, bytearray] = {}
+    single = [('volume', 12)]
+    batch = [('volume', 12), ('balance', 40), ('ambient_sound', (10, 1))]
+    n = 20000 if quick else 200000
+    return {
+        "single_packets_per_s": _rate(lambda: _encode_settings(single, 7, buffers), n),
+        "batch3_packets_per_s": 3 * _rate(lambda: _encode_settings(batch, 7, buffers), n // 3),
+    }
+
+
+def bench_decode(quick: bool) -> Dict[str, float]:
+    sim = SimulatedHeadset()
+    results = {}
+    n = 20000 if quick else 200000
+    for cmd_id in (protocol.REQ_POWER_STATUS, protocol.REQ_AUDIO_STATUS,
+                   protocol.REQ_NC_STATUS, protocol.REQ_SYSTEM_STATUS):
+        packet = sim._report_packet(cmd_id)
+        as_list = list(packet)
+        results[f"0x{cmd_id:02x}_bytes_per_s"] = _rate(lambda: decode_report(cmd_id, packet), n)
+        results[f"0x{cmd_id:02x}_list_per_s"] = _rate(lambda: decode_report(cmd_id, as_list), n)
+    return results
+
+
+def bench_get_all_data(quick: bool) -> Dict[str, float]:
+    results = {}
+    n = 20 if quick else 100
+    for rtt in RTTS_MS:
+        for mode, reactor in (("sync", False), ("reactor", True)):
+            sim = SimulatedHeadset(latency=rtt / 1000)
+            with ZoneHeadset(transport=sim, reactor=reactor) as headset:
+                headset.get_all_data()
+                results[f"{mode}_rtt{rtt:g}ms_ms"] = _median_ms(headset.get_all_data, n)
+    return results
+
+
+def bench_group_refresh(quick: bool) -> Dict[str, float]:
+    """get_all_data() on four headsets with different RTTs, one after another and as a HeadsetGroup."""
+    sims = [SimulatedHeadset(latency=rtt / 1000, serial=f"SIM{i}") for i, rtt in enumerate((0.5, 1.0, 1.5, 2.0))]
+    n = 10 if quick else 50
+    with HeadsetGroup({sim.serial: ZoneHeadset(transport=sim, reactor=True) for sim in sims}) as group:
+        group.get_all_data()
+        slowest = group.headsets[sims[-1].serial]
+        return {
+            "slowest_alone_ms": _median_ms(slowest.get_all_data, n),
+            "sequential_ms": _median_ms(lambda: [h.get_all_data() for h in group.headsets.values()], n),
+            "group_ms": _median_ms(group.get_all_data, n),
+        }
+
+
+def bench_listen(quick: bool) -> Dict[str, float]:
+    sim = SimulatedHeadset()
+    packets = [sim._event_packet(cmd_id) for cmd_id in (protocol.EVT_VOL_CHANGED, protocol.EVT_POWER,
+                                                         protocol.EVT_MIC_MUTE, protocol.EVT_BT_STATE)]
+    n = 20000 if quick else 200000
+    with ZoneHeadset(transport=_EventFeed(packets)) as headset:
+        best = float("inf")
+        for _ in range(3):
+            start = time.perf_counter()
+            for _ in islice(headset.listen(), n):
+                pass
+            best = min(best, time.perf_counter() - start)
+
+        tracemalloc.start()
+        retained = list(islice(headset.listen(), n))
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return {
+        "events_per_s": n / best,
+        "retained_bytes_per_event": current / len(retained),
+    }
+
+
+def bench_cli_cold_start(quick: bool) -> Dict[str, float]:
+    env = dict(os.environ, ZONEOUT_TRANSPORT="simulator")
+    cmd = [sys.executable, "-m", "zoneout.cli", "--no-daemon", "--get", "battery"]
+    samples = []
+    for _ in range(3 if quick else 10):
+        start = time.perf_counter()
+        subprocess.run(cmd, env=env, check=True, stdout=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], check=True)
+    interpreter = time.perf_counter() - start
+    return {
+        "get_battery_ms": statistics.median(samples) * 1e3,
+        "bare_interpreter_ms": interpreter * 1e3,
+    }
+
+
+def bench_gui_resync(quick: bool) -> Dict[str, Any]:
+    """The GUI's reconnect path: start_resync() until _apply_report() has taken every report."""
+    try:
+        from PyQt6.QtCore import QCoreApplication
+        from zoneout.gui.controller import HeadsetController
+    except ImportError as e:
+        return {"skipped": f"PyQt6 not available ({e})"}
+
+    app = QCoreApplication.instance() or QCoreApplication([])
+    results: Dict[str, Any] = {}
+    for rtt in RTTS_MS:
+        controller = HeadsetController(transport=SimulatedHeadset(latency=rtt / 1000),
+                                       hotplug=False, battery_history=False)
+        app.processEvents()  # runs the queued connect_device()
+        controller._resync_thread.wait()
+        app.processEvents()
+
+        def resync() -> None:
+            controller.start_resync()
+            controller._resync_thread.wait()
+            app.processEvents()
+
+        try:
+            results[f"resync_rtt{rtt:g}ms_ms"] = _median_ms(resync, 10 if quick else 50)
+        finally:
+            controller.stop_monitor()
+            controller.stop_resync()
+            controller._headset.close()
+            controller._headset = None
+    return results
+
+
+BENCHMARKS: Dict[str, Callable[[bool], Dict[str, Any]]] = {
+    "encode": bench_encode,
+    "decode": bench_decode,
+    "get_all_data": bench_get_all_data,
+    "group_refresh": bench_group_refresh,
+    "listen": bench_listen,
+    "cli_cold_start": bench_cli_cold_start,
+    "gui_resync": bench_gui_resync,
+}
+
+
+def _metadata() -> Dict[str, Any]:
+    try:
+        commit: Optional[str] = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def _compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]]) -> None:
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            old = baseline.get(name, {}).get(metric)
+            if isinstance(value, (int, float)) and isinstance(old, (int, float)) and old:
+                label = f"{name}.{metric}"
+                print(f"{label:<44} {old:>14.3f} -> {value:>14.3f} ({(value / old - 1) * 100:+.1f}%)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--only', action='append', choices=list(BENCHMARKS), help="Run only these benchmarks.")
+    parser.add_argument('--quick', action='store_true', help="Fewer iterations, for a smoke run.")
+    parser.add_argument('--json', metavar='FILE', help="Write the results to FILE ('-' for stdout).")
+    parser.add_argument('--compare', metavar='FILE', help="Print the change against an earlier --json file.")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.only or BENCHMARKS:
+        results[name] = BENCHMARKS[name](args.quick)
+        if args.json != '-':
+            for metric, value in results[name].items():
+                label = f"{name}.{metric}"
+                print(f"{label:<44} {value:>14.3f}" if isinstance(value, float) else f"{label:<44} {value}")
+
+    report = {"meta": _metadata(), "results": results}
+    if args.json == '-':
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    elif args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            _compare(results, json.load(f)["results"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Compares the hidapi and hidraw transports on a connected headset.
+
+For each backend, measures the round-trip latency of status report reads and the CPU
+time the reactor thread burns while idle and while serving those reads.
+
+    python benchmarks/transport_bench.py --reads 500 --idle 5
+"""
+import argparse
+import statistics
+import time
+
+from zoneout import protocol
+from zoneout.device import ZoneHeadset
+
+
+def bench(transport: str, reads: int, idle: float) -> dict:
+    with ZoneHeadset(reactor=True, transport=transport) as headset:
+        headset.get_reports(protocol.REQ_AUDIO_STATUS)
+
+        cpu = time.process_time()
+        time.sleep(idle)
+        idle_cpu = (time.process_time() - cpu) / idle
+
+        samples = []
+        cpu = time.process_time()
+        for _ in range(reads):
+            start = time.perf_counter()
+            headset.get_reports(protocol.REQ_AUDIO_STATUS)
+            samples.append(time.perf_counter() - start)
+        busy_cpu = (time.process_time() - cpu) / reads
+
+    samples.sort()
+    return {
+        "p50_ms": statistics.median(samples) * 1e3,
+        "p99_ms": samples[int(len(samples) * 0.99) - 1] * 1e3,
+        "idle_cpu_ms_per_s": idle_cpu * 1e3,
+        "cpu_us_per_read": busy_cpu * 1e6,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--reads', type=int, default=500, help="Report reads per transport.")
+    parser.add_argument('--idle', type=float, default=5.0, help="Seconds to measure idle CPU for.")
+    parser.add_argument('--transport', action='append', choices=['hidapi', 'hidraw'],
+                        help="Transport(s) to measure (default: both).")
+    args = parser.parse_args()
+
+    print(f"{'transport':<10} {'p50 ms':>8} {'p99 ms':>8} {'idle CPU ms/s':>14} {'CPU us/read':>12}")
+    for name in args.transport or ('hidapi', 'hidraw'):
+        r = bench(name, args.reads, args.idle)
+        print(f"{name:<10} {r['p50_ms']:>8.3f} {r['p99_ms']:>8.3f} "
+              f"{r['idle_cpu_ms_per_s']:>14.3f} {r['cpu_us_per_read']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,49 @@
-from .device import ZoneHeadset
-from .exceptions import ZoneError, DeviceNotFoundError, ProtocolError
-from .models import (
-    NcMode, BootNcMode, BootBtMode, Language, EventType,
-    AudioStatus, NcStatus, SystemStatus, HeadsetFullStatus, HeadsetEvent, PowerState
-)
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Dict, List
+
+if TYPE_CHECKING:
+    from .device import ZoneHeadset, StopToken
+    from .aio import AsyncZoneHeadset
+    from .group import HeadsetGroup, enumerate_headsets
+    from .hotplug import HotplugWatcher
+    from .metrics import HeadsetMetrics
+    from .exceptions import ZoneError, DeviceNotFoundError, ProtocolError, GroupError, DeviceBusyError
+    from .models import (
+        NcMode, BootNcMode, BootBtMode, Language, EventType, AudioStatus, NcStatus, SystemStatus,
+        HeadsetFullStatus, HeadsetEvent, PowerState, DeviceInfo, HeadsetInfo
+    )
 
 __all__ = [
-    "ZoneHeadset",
-    "ZoneError",
-    "DeviceNotFoundError",
-    "ProtocolError",
-    "NcMode",
-    "BootNcMode",
-    "BootBtMode",
-    "Language",
-    "EventType",
-    "AudioStatus",
-    "NcStatus",
-    "SystemStatus",
-    "HeadsetFullStatus",
-    "HeadsetEvent",
-    "PowerState",
-]
\ No newline at end of file
+    "ZoneHeadset", "StopToken", "AsyncZoneHeadset", "HeadsetGroup", "enumerate_headsets", "HotplugWatcher", "HeadsetMetrics",
+    "ZoneError", "DeviceNotFoundError", "ProtocolError", "GroupError", "DeviceBusyError",
+    "NcMode", "BootNcMode", "BootBtMode", "Language", "EventType", "AudioStatus", "NcStatus", "SystemStatus",
+    "HeadsetFullStatus", "HeadsetEvent", "PowerState", "DeviceInfo", "HeadsetInfo",
+]
+
+# Submodule providing each public name. Names are imported on first access, so
+# `import zoneout` (and the CLI) does not load hidapi, asyncio or the decoders upfront.
+_EXPORTS: Dict[str, str] = {
+    **dict.fromkeys(("ZoneHeadset", "StopToken"), "device"),
+    "AsyncZoneHeadset": "aio",
+    **dict.fromkeys(("HeadsetGroup", "enumerate_headsets"), "group"),
+    "HotplugWatcher": "hotplug",
+    "HeadsetMetrics": "metrics",
+    **dict.fromkeys(("ZoneError", "DeviceNotFoundError", "ProtocolError", "GroupError", "DeviceBusyError"), "exceptions"),
+    **dict.fromkeys((
+        "NcMode", "BootNcMode", "BootBtMode", "Language", "EventType", "AudioStatus", "NcStatus", "SystemStatus",
+        "HeadsetFullStatus", "HeadsetEvent", "PowerState", "DeviceInfo", "HeadsetInfo",
+    ), "models"),
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted([*globals(), *__all__])
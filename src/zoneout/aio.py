@@ -0,0 +1,335 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, FrozenSet, Hashable, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+from . import protocol
+from .arbiter import DeviceArbiter
+from .decoders import decode_event, decode_report, event_cmds
+from .device import _clamp, _encode_settings, _open_device
+from .exceptions import DeviceNotFoundError, ProtocolError
+from .models import (
+    AudioStatus, DeviceInfo, NcStatus, SystemStatus, HeadsetFullStatus, HeadsetEvent, EventType, PowerState
+)
+
+
+_DISCONNECTED = object()
+
+
+def _resolve(fut: asyncio.Future) -> None:
+    if not fut.done():
+        fut.set_result(None)
+
+
+class AsyncZoneHeadset:
+    """asyncio counterpart of ZoneHeadset.
+
+    The handle is switched to non-blocking mode and drained by one reader task on the
+    event loop, which resolves pending report futures and feeds `events()` iterators.
+    With a transport exposing fileno() (hidraw), the task sleeps until the loop reports
+    the descriptor readable; otherwise it polls every `active_poll_ms` while requests
+    are in flight and backs off to `idle_poll_ms`. Writes complete on the device
+    acknowledgement, see ZoneHeadset for `ack_timeout`/`wait_for_ack`, `transport`, `path`
+    and `arbitrate`/`arbitration_timeout`; waiting for an arbiter turn runs in the loop's
+    default executor, so it never blocks the event loop.
+    """
+
+    def __init__(self, active_poll_ms: float = 1, idle_poll_ms: float = 20,
+                 ack_timeout: float = 0.25, wait_for_ack: bool = True,
+                 transport: Union[str, Any, None] = None, path: Optional[str] = None,
+                 arbitrate: bool = True, arbitration_timeout: float = 1.0) -> None:
+        self.device: Optional[Any] = None
+        self.seq: int = 1
+        self.ack_timeout = ack_timeout
+        self.wait_for_ack = wait_for_ack
+        self.active_poll = active_poll_ms / 1000
+        self.idle_poll = idle_poll_ms / 1000
+        self.error: Optional[BaseException] = None
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+        self._subscribers: Dict[asyncio.Queue, Optional[FrozenSet[int]]] = {}
+        self._reader: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Future] = None
+        self._write_buffers: Dict[str, bytearray] = {}
+        self.transport = transport
+        self.path = path
+        self.arbitrate = arbitrate
+        self.arbitration_timeout = arbitration_timeout
+        self._arbiter: Optional[DeviceArbiter] = None
+
+    async def connect(self) -> None:
+        self.device = _open_device(self.transport, self.path)
+        self.device.set_nonblocking(1)
+        device_path = getattr(self.device, "device_path", None)
+        if self.arbitrate and device_path and DeviceArbiter.supported:
+            self._arbiter = DeviceArbiter(device_path, self.arbitration_timeout)
+            self._arbiter.open()
+        self.error = None
+        self._reader = asyncio.get_running_loop().create_task(self._read_loop())
+
+    async def close(self) -> None:
+        if self._reader:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except asyncio.CancelledError:
+                pass
+            self._reader = None
+        if self.error is None:
+            self._fail(DeviceNotFoundError("Device closed"))
+        if self._arbiter:
+            self._arbiter.close()
+            self._arbiter = None
+        if self.device:
+            self.device.close()
+            self.device = None
+
+    async def __aenter__(self) -> "AsyncZoneHeadset":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    async def _read_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        fileno = getattr(self.device, "fileno", None)
+        if fileno is not None:
+            await self._read_when_ready(loop, fileno())
+            return
+        while True:
+            try:
+                data = self.device.read(64)
+            except Exception as e:
+                self._fail(e)
+                return
+            if data:
+                self._dispatch(data)
+            elif self._pending:
+                await asyncio.sleep(self.active_poll)
+            else:
+                self._wakeup = loop.create_future()
+                timer = loop.call_later(self.idle_poll, _resolve, self._wakeup)
+                await self._wakeup
+                timer.cancel()
+
+    async def _read_when_ready(self, loop: asyncio.AbstractEventLoop, fd: int) -> None:
+        readable = asyncio.Event()
+        loop.add_reader(fd, readable.set)
+        try:
+            while True:
+                try:
+                    data = self.device.read(64)
+                except Exception as e:
+                    self._fail(e)
+                    return
+                if data:
+                    self._dispatch(data)
+                else:
+                    readable.clear()
+                    await readable.wait()
+        finally:
+            loop.remove_reader(fd)
+
+    def _wake_reader(self) -> None:
+        if self._wakeup is not None:
+            _resolve(self._wakeup)
+
+    def _dispatch(self, data: List[int]) -> None:
+        if protocol.is_event(data):
+            cmd = data[9]
+            for q, cmds in self._subscribers.items():
+                if cmds is None or cmd in cmds:
+                    q.put_nowait(data)
+        elif len(data) >= 64:
+            fut = self._pending.pop(protocol.ack_key(data), None) or self._pending.pop(data[9], None)
+            if fut is not None and not fut.done():
+                fut.set_result(data)
+
+    def _fail(self, error: BaseException) -> None:
+        self.error = error
+        pending, self._pending = self._pending, {}
+        for fut in pending.values():
+            if not fut.done():
+                fut.set_exception(DeviceNotFoundError("Device disconnected"))
+        for q in self._subscribers:
+            q.put_nowait(_DISCONNECTED)
+
+    def _check_connected(self) -> None:
+        if not self.device:
+            raise DeviceNotFoundError("Device not connected")
+        if self.error is not None:
+            raise DeviceNotFoundError("Device disconnected") from self.error
+
+    @asynccontextmanager
+    async def _turn(self, seqs: int = 0) -> AsyncIterator[Optional[int]]:
+        """Async ZoneHeadset._turn(): yields the first shared sequence number (None if not arbitrated)."""
+        if self._arbiter is None:
+            yield None
+            return
+        turn = self._arbiter.turn(seqs)
+        granted = asyncio.get_running_loop().run_in_executor(None, turn.__enter__)
+
+        def give_back(fut: asyncio.Future) -> None:
+            if not fut.cancelled() and fut.exception() is None:
+                turn.__exit__(None, None, None)
+
+        try:
+            seq = await asyncio.shield(granted)
+        except asyncio.CancelledError:
+            # The executor may still be granted the turn after the caller gave up on it.
+            granted.add_done_callback(give_back)
+            raise
+        try:
+            yield seq
+        finally:
+            turn.__exit__(None, None, None)
+
+    async def _get_reports(self, cmd_ids: Sequence[int], timeout: float = 0.15) -> Dict[int, List[int]]:
+        self._check_connected()
+        async with self._turn():
+            return await self._exchange_reports(cmd_ids, timeout)
+
+    async def _exchange_reports(self, cmd_ids: Sequence[int], timeout: float) -> Dict[int, List[int]]:
+        loop = asyncio.get_running_loop()
+        futures = {}
+        for cmd_id in dict.fromkeys(cmd_ids):
+            fut = self._pending.get(cmd_id)
+            if fut is None:
+                fut = self._pending[cmd_id] = loop.create_future()
+                self.device.write(protocol.read_request(cmd_id))
+            futures[cmd_id] = fut
+        self._wake_reader()
+
+        try:
+            done = await asyncio.wait_for(asyncio.gather(*map(asyncio.shield, futures.values())), timeout)
+        except asyncio.TimeoutError:
+            missing = [c for c, f in futures.items() if not f.done()]
+            error = ProtocolError(f"Timeout waiting for Report CMD {', '.join(hex(c) for c in missing)}")
+            self._expire(futures, error)
+            raise error from None
+        return dict(zip(futures, done))
+
+    def _expire(self, futures: Dict[Hashable, asyncio.Future], error: Exception) -> None:
+        for key, fut in futures.items():
+            if self._pending.get(key) is fut:
+                del self._pending[key]
+            if not fut.done():
+                fut.set_exception(error)
+                fut.exception()
+
+    async def get_reports(self, *cmd_ids: int) -> Dict[int, Any]:
+        raw = await self._get_reports(cmd_ids)
+        return {cmd_id: decode_report(cmd_id, raw[cmd_id]) for cmd_id in cmd_ids}
+
+    async def get_device_info(self) -> DeviceInfo:
+        return (await self.get_reports(protocol.REQ_DEVICE_INFO))[protocol.REQ_DEVICE_INFO]
+
+    async def get_power_status(self) -> PowerState:
+        return (await self.get_reports(protocol.REQ_POWER_STATUS))[protocol.REQ_POWER_STATUS]
+
+    async def get_audio_status(self) -> AudioStatus:
+        return (await self.get_reports(protocol.REQ_AUDIO_STATUS))[protocol.REQ_AUDIO_STATUS]
+
+    async def get_nc_status(self) -> NcStatus:
+        return (await self.get_reports(protocol.REQ_NC_STATUS))[protocol.REQ_NC_STATUS]
+
+    async def get_system_status(self) -> SystemStatus:
+        return (await self.get_reports(protocol.REQ_SYSTEM_STATUS))[protocol.REQ_SYSTEM_STATUS]
+
+    async def get_all_data(self) -> HeadsetFullStatus:
+        reports = await self.get_reports(
+            protocol.REQ_AUDIO_STATUS, protocol.REQ_NC_STATUS, protocol.REQ_SYSTEM_STATUS
+        )
+        return HeadsetFullStatus(
+            audio=reports[protocol.REQ_AUDIO_STATUS],
+            nc=reports[protocol.REQ_NC_STATUS],
+            system=reports[protocol.REQ_SYSTEM_STATUS]
+        )
+
+    async def _send_cmd(self, setting_key: str, value: Union[int, Tuple[int, ...]],
+                        wait: Optional[bool] = None) -> None:
+        await self._write_settings([(setting_key, value)], wait)
+
+    async def apply(self, settings: Mapping[str, Union[int, Tuple[int, ...]]],
+                    wait: Optional[bool] = None) -> None:
+        """Async counterpart of ZoneHeadset.apply()."""
+        await self._write_settings([(key, _clamp(key, value)) for key, value in settings.items()], wait)
+
+    async def _write_settings(self, items: Sequence[Tuple[str, Union[int, Tuple[int, ...]]]],
+                              wait: Optional[bool]) -> None:
+        self._check_connected()
+        async with self._turn(len(items)) as shared_seq:
+            if shared_seq is not None:
+                self.seq = shared_seq
+            await self._send_and_await(items, wait)
+
+    async def _send_and_await(self, items: Sequence[Tuple[str, Union[int, Tuple[int, ...]]]],
+                              wait: Optional[bool]) -> None:
+        packets, self.seq = _encode_settings(items, self.seq, self._write_buffers)
+
+        if not (self.wait_for_ack if wait is None else wait):
+            for _, data in packets:
+                self.device.write(data)
+            return
+
+        loop = asyncio.get_running_loop()
+        acks = {protocol.ack_key(data): setting_key for setting_key, data in packets}
+        futures = {}
+        for key in acks:
+            futures[key] = self._pending[key] = loop.create_future()
+        for _, data in packets:
+            self.device.write(data)
+        self._wake_reader()
+        try:
+            await asyncio.wait_for(asyncio.gather(*map(asyncio.shield, futures.values())), self.ack_timeout)
+        except asyncio.TimeoutError:
+            key = next(k for k, f in futures.items() if not f.done())
+            error = ProtocolError(f"No acknowledgement for {acks[key]} (seq {key[1]})")
+            self._expire(futures, error)
+            raise error from None
+
+    async def set_volume(self, value: int) -> None:
+        await self._send_cmd('volume', _clamp('volume', value))
+
+    async def set_balance(self, value: int) -> None:
+        await self._send_cmd('balance', _clamp('balance', value))
+
+    async def set_sidetone(self, value: int) -> None:
+        await self._send_cmd('sidetone', _clamp('sidetone', value))
+
+    async def set_noise_cancelling(self, mode: int) -> None:
+        await self._send_cmd('nc_mode', _clamp('nc_mode', mode))
+
+    async def set_auto_power_off(self, minutes: int) -> None:
+        await self._send_cmd('auto_off', _clamp('auto_off', minutes))
+
+    async def set_notification_voice(self, enabled: bool) -> None:
+        await self._send_cmd('notif_voice', 1 if enabled else 0)
+
+    async def set_voice_language(self, lang_idx: int) -> None:
+        await self._send_cmd('voice_lang', _clamp('voice_lang', lang_idx))
+
+    async def set_boot_nc_mode(self, mode: int) -> None:
+        await self._send_cmd('boot_nc', _clamp('boot_nc', mode))
+
+    async def set_boot_bt_mode(self, mode: int) -> None:
+        await self._send_cmd('boot_bt', _clamp('boot_bt', mode))
+
+    async def set_ambient_sound(self, level: int, focus: bool) -> None:
+        await self._send_cmd('ambient_sound', _clamp('ambient_sound', (level, 1 if focus else 0)))
+
+    async def events(self, types: Optional[Iterable[EventType]] = None) -> AsyncIterator[HeadsetEvent]:
+        """Async counterpart of ZoneHeadset.listen()."""
+        self._check_connected()
+        q: asyncio.Queue = asyncio.Queue()
+        self._subscribers[q] = event_cmds(types)
+        try:
+            while True:
+                data = await q.get()
+                if data is _DISCONNECTED:
+                    raise DeviceNotFoundError("Device disconnected") from self.error
+
+                event = decode_event(data)
+                if event is not None:
+                    yield event
+        finally:
+            self._subscribers.pop(q, None)
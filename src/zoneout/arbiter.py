@@ -0,0 +1,160 @@
+import errno
+import os
+import struct
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # type: ignore[assignment]
+
+from .exceptions import DeviceBusyError
+
+
+# State at the start of the lock file: next ticket number and next write sequence number.
+_STATE = struct.Struct("<QB")
+# Each ticket owns one byte at TICKET_BASE + ticket % TICKET_SLOTS while it is queued or
+# running; a new ticket waits until the WAIT_WINDOW tickets before it are released.
+TICKET_BASE = 64
+TICKET_SLOTS = 1 << 20
+WAIT_WINDOW = TICKET_SLOTS // 2
+# struct flock: l_type, l_whence, l_start, l_len, l_pid.
+_FLOCK = "hhqqi"
+
+_OFD_SETLK = getattr(fcntl, "F_OFD_SETLK", None)
+
+
+def runtime_path(suffix: str) -> str:
+    """`zoneout<suffix>` in $XDG_RUNTIME_DIR, else a per-user file in the temporary directory."""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, f"zoneout{suffix}")
+    return os.path.join(tempfile.gettempdir(), f"zoneout-{os.getuid()}{suffix}")
+
+
+def _next_seq(seq: int, count: int) -> int:
+    return (seq - 1 + count) % 255 + 1
+
+
+class DeviceArbiter:
+    """Serializes request/response exchanges on one device across processes.
+
+    Each exchange takes a ticket from a small lock file (under flock) and holds an
+    open-file-description lock on its ticket's byte until it is done, then waits until
+    the tickets before it are released: exchanges run in FIFO order, and a process that
+    dies mid-exchange releases its ticket with its file. The lock file also holds the
+    write sequence number, so every process numbers its writes from one counter.
+
+    Waits are bounded by `timeout` and raise DeviceBusyError. Without OFD locks (non-Linux)
+    a plain flock is used, which is not FIFO; without fcntl (Windows) `supported` is False.
+    """
+
+    supported = fcntl is not None
+
+    def __init__(self, device_path: str, timeout: float = 1.0) -> None:
+        key = "".join(c if c.isalnum() else "_" for c in device_path.strip("/"))
+        self.path = runtime_path(f"-{key}.lock")
+        self.timeout = timeout
+        self._fd = -1
+        self._lock = threading.Lock()
+
+    def open(self) -> None:
+        old_umask = os.umask(0o177)
+        try:
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_CLOEXEC, 0o600)
+        finally:
+            os.umask(old_umask)
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    @contextmanager
+    def turn(self, seqs: int = 0) -> Iterator[int]:
+        """Holds the device for one exchange; yields the first of `seqs` reserved sequence numbers."""
+        deadline = time.monotonic() + self.timeout
+        if not self._lock.acquire(timeout=self.timeout):
+            raise DeviceBusyError(f"Device busy in this process for over {self.timeout}s")
+        try:
+            if _OFD_SETLK is None:
+                with self._flock_turn(seqs, deadline) as seq:
+                    yield seq
+                return
+            ticket, seq = self._take_ticket(seqs)
+            slot = TICKET_BASE + ticket % TICKET_SLOTS
+            try:
+                self._wait_for_predecessors(ticket, deadline)
+                yield seq
+            finally:
+                self._range_lock(fcntl.F_UNLCK, slot, 1)
+        finally:
+            self._lock.release()
+
+    def _take_ticket(self, seqs: int) -> Tuple[int, int]:
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            ticket, seq = self._read_state()
+            if not self._range_lock(fcntl.F_WRLCK, TICKET_BASE + ticket % TICKET_SLOTS, 1):
+                raise DeviceBusyError(f"Ticket slot {ticket % TICKET_SLOTS} of {self.path} is still held")
+            os.pwrite(self._fd, _STATE.pack(ticket + 1, _next_seq(seq, seqs)), 0)
+            return ticket, seq
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _read_state(self) -> Tuple[int, int]:
+        data = os.pread(self._fd, _STATE.size, 0)
+        return _STATE.unpack(data) if len(data) == _STATE.size else (0, 1)
+
+    def _wait_for_predecessors(self, ticket: int, deadline: float) -> None:
+        end = ticket % TICKET_SLOTS
+        start = (ticket - WAIT_WINDOW) % TICKET_SLOTS
+        if start < end:
+            ranges = [(start, end - start)]
+        else:
+            ranges = [(start, TICKET_SLOTS - start), (0, end)]
+        for offset, length in ranges:
+            if length:
+                self._wait(lambda: self._range_lock(fcntl.F_RDLCK, TICKET_BASE + offset, length), deadline)
+                self._range_lock(fcntl.F_UNLCK, TICKET_BASE + offset, length)
+
+    @contextmanager
+    def _flock_turn(self, seqs: int, deadline: float) -> Iterator[int]:
+        self._wait(lambda: self._try_flock(), deadline)
+        try:
+            ticket, seq = self._read_state()
+            os.pwrite(self._fd, _STATE.pack(ticket + 1, _next_seq(seq, seqs)), 0)
+            yield seq
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _try_flock(self) -> bool:
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            return False
+
+    def _range_lock(self, kind: int, start: int, length: int) -> bool:
+        """Non-blocking OFD lock on [start, start + length); False if another holder conflicts."""
+        try:
+            fcntl.fcntl(self._fd, _OFD_SETLK, struct.pack(_FLOCK, kind, os.SEEK_SET, start, length, 0))
+            return True
+        except OSError as e:
+            if e.errno in (errno.EAGAIN, errno.EACCES):
+                return False
+            raise
+
+    def _wait(self, attempt, deadline: float) -> None:
+        """Retries `attempt` with a short backoff while the device is held elsewhere."""
+        delay = 0.0002
+        while not attempt():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise DeviceBusyError(f"Device held by another process for over {self.timeout}s ({self.path})")
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 0.001)
@@ -0,0 +1,188 @@
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, NamedTuple, Optional, Sequence
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # type: ignore[assignment]
+
+
+HISTORY_MAGIC = b"ZOBATT01"
+# magic, capacity in records, records appended so far (the ring position).
+_HEADER = struct.Struct("<8sIQ")
+# wall-clock time, level in percent, charging.
+RECORD = struct.Struct("<dBB")
+DEFAULT_CAPACITY = 1 << 16
+DEFAULT_WINDOW = 3 * 3600.0
+
+
+class BatteryRecord(NamedTuple):
+    time: float
+    level: int
+    charging: bool
+
+
+class BatteryEstimate(NamedTuple):
+    level: int
+    charging: bool
+    rate: float
+    """Percent per hour, negative while discharging."""
+    seconds: float
+    """Until empty while discharging, until full while charging."""
+
+
+def history_path() -> str:
+    """battery.hist under $XDG_DATA_HOME/zoneout (by default ~/.local/share/zoneout)."""
+    data_home = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(data_home, "zoneout", "battery.hist")
+
+
+class BatteryHistory:
+    """Battery readings kept in a memory-mapped ring file.
+
+    The file holds a small header and `capacity` fixed-size records (time, level,
+    charging); append() writes one record in place and advances the counter, so it is
+    O(1) and the file never grows: the default 65536 records take 640 KiB and, since only
+    changes are stored, cover months of use. Processes sharing the file (daemon, GUI,
+    CLI) serialize appends with flock.
+    """
+
+    def __init__(self, path: Optional[str] = None, capacity: int = DEFAULT_CAPACITY) -> None:
+        self.path = path or history_path()
+        self.capacity = capacity
+        self._fd = -1
+        self._map: Optional[mmap.mmap] = None
+        self._lock = threading.Lock()
+
+    def open(self) -> None:
+        """Creates the file if needed; raises OSError, or ValueError for a file that is not a history."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_CLOEXEC, 0o644)
+        try:
+            self._fd = fd
+            with self._file_lock():
+                if os.fstat(fd).st_size == 0:
+                    os.ftruncate(fd, _HEADER.size + self.capacity * RECORD.size)
+                    os.pwrite(fd, _HEADER.pack(HISTORY_MAGIC, self.capacity, 0), 0)
+                magic, capacity, _ = _HEADER.unpack(os.pread(fd, _HEADER.size, 0))
+                if magic != HISTORY_MAGIC or os.fstat(fd).st_size != _HEADER.size + capacity * RECORD.size:
+                    raise ValueError(f"{self.path} is not a zoneout battery history")
+                self.capacity = capacity
+            self._map = mmap.mmap(fd, 0)
+        except BaseException:
+            os.close(fd)
+            self._fd = -1
+            raise
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def __enter__(self) -> "BatteryHistory":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return min(self._count(), self.capacity)
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        if fcntl is None:
+            yield
+            return
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _count(self) -> int:
+        return _HEADER.unpack_from(self._map, 0)[2]
+
+    def _record(self, index: int) -> BatteryRecord:
+        timestamp, level, charging = RECORD.unpack_from(self._map, _HEADER.size + index % self.capacity * RECORD.size)
+        return BatteryRecord(timestamp, level, bool(charging))
+
+    def append(self, level: int, charging: bool, timestamp: Optional[float] = None) -> bool:
+        """Stores a reading unless it repeats the latest one; returns whether it was stored."""
+        with self._lock, self._file_lock():
+            count = self._count()
+            if count:
+                last = self._record(count - 1)
+                if last.level == level and last.charging == bool(charging):
+                    return False
+            RECORD.pack_into(self._map, _HEADER.size + count % self.capacity * RECORD.size,
+                             time.time() if timestamp is None else timestamp, level, bool(charging))
+            _HEADER.pack_into(self._map, 0, HISTORY_MAGIC, self.capacity, count + 1)
+            return True
+
+    def records(self, since: Optional[float] = None) -> List[BatteryRecord]:
+        """Stored readings, oldest first; with `since`, only those at or after that time.
+
+        Walks back from the newest record, so a recent window costs only its own length.
+        """
+        count = self._count()
+        found = []
+        for index in range(count - 1, max(count - self.capacity, 0) - 1, -1):
+            record = self._record(index)
+            if since is not None and record.time < since:
+                break
+            found.append(record)
+        found.reverse()
+        return found
+
+    def estimate(self, window: float = DEFAULT_WINDOW, now: Optional[float] = None) -> Optional[BatteryEstimate]:
+        now = time.time() if now is None else now
+        return estimate_battery(self.records(since=now - window), now)
+
+
+def estimate_battery(records: Sequence[BatteryRecord], now: Optional[float] = None) -> Optional[BatteryEstimate]:
+    """Time to empty (or to full while charging) from a least-squares fit of level over time.
+
+    Only the readings since the latest switch between charging and discharging are
+    used. Returns None without at least two distinct levels or when the trend goes the
+    wrong way (e.g. a level that recovered after a load spike).
+    """
+    if not records:
+        return None
+    charging = records[-1].charging
+    start = len(records) - 1
+    while start > 0 and records[start - 1].charging == charging:
+        start -= 1
+    run = records[start:]
+    if len({record.level for record in run}) < 2:
+        return None
+
+    mean_t = sum(record.time for record in run) / len(run)
+    mean_level = sum(record.level for record in run) / len(run)
+    spread = sum((record.time - mean_t) ** 2 for record in run)
+    slope = sum((record.time - mean_t) * (record.level - mean_level) for record in run) / spread
+    if (slope > 0) != charging or slope == 0:
+        return None
+
+    now = time.time() if now is None else now
+    level_now = min(100.0, max(0.0, mean_level + slope * (now - mean_t)))
+    seconds = (100.0 - level_now) / slope if charging else level_now / -slope
+    return BatteryEstimate(run[-1].level, charging, slope * 3600, seconds)
+
+
+def open_history(path: Optional[str] = None) -> Optional[BatteryHistory]:
+    """Opens the history, or returns None where it cannot be (read-only home, foreign file)."""
+    history = BatteryHistory(path)
+    try:
+        history.open()
+    except (OSError, ValueError):
+        return None
+    return history
@@ -0,0 +1,122 @@
+import threading
+import time
+from dataclasses import fields, replace
+from typing import Any, Dict, Iterable, Mapping, NamedTuple, Optional, Tuple
+
+from . import protocol
+from .models import HeadsetEvent, EventType
+
+
+class CachedReport(NamedTuple):
+    value: Any
+    age: float
+
+
+# Report fields each event updates: (REQ_* id, model field or None for the whole report,
+# attribute of the event value or None for the value itself).
+EVENT_FIELDS: Dict[EventType, Tuple[Tuple[int, Optional[str], Optional[str]], ...]] = {
+    EventType.POWER: (
+        (protocol.REQ_POWER_STATUS, None, None),
+        (protocol.REQ_AUDIO_STATUS, 'charging', 'charging'),
+        (protocol.REQ_AUDIO_STATUS, 'battery_level', 'battery_level'),
+    ),
+    EventType.VOLUME: ((protocol.REQ_AUDIO_STATUS, 'volume', None),),
+    EventType.BALANCE: ((protocol.REQ_AUDIO_STATUS, 'balance', None),),
+    EventType.NC_MODE: ((protocol.REQ_NC_STATUS, 'nc_mode', None),),
+    EventType.MIC_MUTE: ((protocol.REQ_NC_STATUS, 'mic_muted', None),),
+    EventType.MIC_CONN: ((protocol.REQ_SYSTEM_STATUS, 'mic_connected', None),),
+    EventType.BLUETOOTH: ((protocol.REQ_SYSTEM_STATUS, 'bt_state', None),),
+}
+
+# Report that holds each WRITE_MAP setting; it is invalidated when the setting is written.
+WRITE_REPORTS: Dict[str, int] = {
+    'volume': protocol.REQ_AUDIO_STATUS,
+    'balance': protocol.REQ_AUDIO_STATUS,
+    'sidetone': protocol.REQ_AUDIO_STATUS,
+    'nc_mode': protocol.REQ_NC_STATUS,
+    'ambient_sound': protocol.REQ_NC_STATUS,
+    'auto_off': protocol.REQ_SYSTEM_STATUS,
+    'notif_voice': protocol.REQ_SYSTEM_STATUS,
+    'voice_lang': protocol.REQ_SYSTEM_STATUS,
+    'boot_nc': protocol.REQ_SYSTEM_STATUS,
+    'boot_bt': protocol.REQ_SYSTEM_STATUS,
+}
+
+# Fields kept current by events and the serial number never expire; everything else is
+# re-read after DEFAULT_TTL, including the battery: POWER events only come while charging.
+DEFAULT_TTL = 30.0
+DEFAULT_TTLS: Dict[str, Optional[float]] = {
+    'serial': None,
+    'volume': None,
+    'balance': None,
+    'nc_mode': None,
+    'mic_muted': None,
+    'mic_connected': None,
+    'bt_state': None,
+}
+
+
+class StatusCache:
+    """Status reports mirrored from reads and events, with a timestamp and TTL per field.
+
+    A report is served while none of its fields has outlived its TTL (seconds, None for
+    never); `ttl` overrides DEFAULT_TTLS by field name. Each entry keeps its expiry and
+    oldest timestamp precomputed, so lookup() is a single dict access.
+    """
+
+    def __init__(self, ttl: Optional[Mapping[str, Optional[float]]] = None,
+                 default_ttl: Optional[float] = DEFAULT_TTL) -> None:
+        self.ttl: Dict[str, Optional[float]] = {**DEFAULT_TTLS, **(ttl or {})}
+        self.default_ttl = default_ttl
+        self._entries: Dict[int, Tuple[Any, float, float]] = {}
+        self._stamps: Dict[int, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def _store(self, cmd_id: int, report: Any, stamps: Dict[str, float]) -> None:
+        expires = oldest = float("inf")
+        for name, stamp in stamps.items():
+            ttl = self.ttl.get(name, self.default_ttl)
+            if ttl is not None:
+                expires = min(expires, stamp + ttl)
+            oldest = min(oldest, stamp)
+        self._stamps[cmd_id] = stamps
+        self._entries[cmd_id] = (report, expires, oldest)
+
+    def update(self, reports: Mapping[int, Any], now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            for cmd_id, report in reports.items():
+                self._store(cmd_id, report, {f.name: now for f in fields(report)})
+
+    def apply_event(self, event: HeadsetEvent, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            for cmd_id, field, attr in EVENT_FIELDS.get(event.type, ()):
+                value = event.value if attr is None else getattr(event.value, attr)
+                if field is None:
+                    self._store(cmd_id, value, {f.name: now for f in fields(value)})
+                elif cmd_id in self._entries:
+                    report = replace(self._entries[cmd_id][0], **{field: value})
+                    self._store(cmd_id, report, {**self._stamps[cmd_id], field: now})
+
+    def invalidate(self, cmd_ids: Iterable[int]) -> None:
+        with self._lock:
+            for cmd_id in cmd_ids:
+                self._entries.pop(cmd_id, None)
+                self._stamps.pop(cmd_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._stamps.clear()
+
+    def lookup(self, cmd_id: int, now: Optional[float] = None) -> Optional[CachedReport]:
+        """Returns the report tagged with the age of its oldest field, or None if missing or expired."""
+        entry = self._entries.get(cmd_id)
+        if entry is None:
+            return None
+        now = time.monotonic() if now is None else now
+        report, expires, oldest = entry
+        if now > expires:
+            return None
+        return CachedReport(report, now - oldest)
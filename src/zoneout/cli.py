@@ -1,28 +1,46 @@
 import argparse
+import os
 import sys
-from typing import Dict, Tuple, Optional, Any
-from .device import ZoneHeadset
+from contextlib import closing, contextmanager
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Tuple, Optional, Any, Union
+from . import protocol
 from .exceptions import DeviceNotFoundError
-from .models import NcMode, BootNcMode, BootBtMode, Language
+from .transport import TRANSPORT_NAMES
+
+if TYPE_CHECKING:
+    from .client import DaemonClient
+    from .device import ZoneHeadset
+    from .group import HeadsetGroup
+    from .models import EventType, HeadsetFullStatus
+    from .ndjson import NdjsonEventWriter
 
 
 VAR_MAP: Dict[str, Tuple[str, str, Optional[str]]] = {
-    'volume': ('audio', 'volume', 'set_volume'),
-    'balance': ('audio', 'balance', 'set_balance'),
-    'sidetone': ('audio', 'sidetone', 'set_sidetone'),
-    'battery': ('audio', 'battery_level', None),
+    'volume': ('audio', 'volume', 'volume'),
+    'balance': ('audio', 'balance', 'balance'),
+    'sidetone': ('audio', 'sidetone', 'sidetone'),
+    'battery': ('power', 'battery_level', None),
+    'charging': ('power', 'charging', None),
+    'battery_eta': ('history', 'battery_eta', None),
 
-    'nc_mode': ('nc', 'nc_mode', 'set_noise_cancelling'),
+    'nc_mode': ('nc', 'nc_mode', 'nc_mode'),
     'mic_muted': ('nc', 'mic_muted', None),
 
-    'auto_off': ('system', 'auto_off_minutes', 'set_auto_power_off'),
-    'language': ('system', 'language', 'set_voice_language'),
-    'notif': ('system', 'notif_enabled', 'set_notification_voice'),
+    'auto_off': ('system', 'auto_off_minutes', 'auto_off'),
+    'language': ('system', 'language', 'voice_lang'),
+    'notif': ('system', 'notif_enabled', 'notif_voice'),
     'mic_connected': ('system', 'mic_connected', None),
-    'boot_nc': ('system', 'boot_nc', 'set_boot_nc_mode'),
-    'boot_bt': ('system', 'boot_bt', 'set_boot_bt_mode'),
-    'ambient_level': ('nc', 'ambient_level', 'set_ambient_sound_level'),
-    'focus_voice': ('nc', 'focus_voice', 'set_ambient_sound_focus'),
+    'boot_nc': ('system', 'boot_nc', 'boot_nc'),
+    'boot_bt': ('system', 'boot_bt', 'boot_bt'),
+    'ambient_level': ('nc', 'ambient_level', 'ambient_sound'),
+    'focus_voice': ('nc', 'focus_on_voice', 'ambient_sound'),
+}
+
+CATEGORY_REPORTS: Dict[str, int] = {
+    'power': protocol.REQ_POWER_STATUS,
+    'audio': protocol.REQ_AUDIO_STATUS,
+    'nc': protocol.REQ_NC_STATUS,
+    'system': protocol.REQ_SYSTEM_STATUS,
 }
 
 VARIABLE_HELP = """
@@ -49,17 +67,299 @@ VARIABLES & ALLOWED VALUES:
 
 [Read Only]
   battery       (0-100%)
+  charging      (0/1)
+  battery_eta   (Minutes until empty, or until full while charging, estimated from
+                 the battery history; "unknown" until there is a trend)
   mic_muted     (0/1)
   mic_connected (0/1)
 """
 
 def format_value(value: Any) -> str:
+    from .models import NcMode, BootNcMode, BootBtMode, Language
+
     if isinstance(value, (NcMode, BootNcMode, BootBtMode, Language)):
         return f"{value.value} ({value.name.replace('_', ' ').title()})"
     if isinstance(value, bool):
         return "On" if value else "Off"
     return str(value)
 
+def parse_var_list(text: str) -> List[str]:
+    names = [name.strip() for name in text.split(',') if name.strip()]
+    if not names:
+        raise argparse.ArgumentTypeError("expected at least one variable")
+    for name in names:
+        if name not in VAR_MAP:
+            raise argparse.ArgumentTypeError(
+                f"unknown variable '{name}' (choose from {', '.join(VAR_MAP)})"
+            )
+    return names
+
+def parse_event_types(text: str) -> List["EventType"]:
+    from .models import EventType
+
+    known = {t.value: t for t in EventType}
+    types = []
+    for name in (n.strip() for n in text.split(',')):
+        if name not in known:
+            raise argparse.ArgumentTypeError(
+                f"unknown event type '{name}' (choose from {', '.join(known)})"
+            )
+        types.append(known[name])
+    return types
+
+def battery_eta(headset: Union["ZoneHeadset", "DaemonClient"]) -> Union[int, str]:
+    """Minutes until empty (or full) from the battery history, without touching the device."""
+    from .battery import open_history
+
+    history = getattr(headset, "battery_history", None)
+    if history is not None:
+        estimate = history.estimate()
+    else:
+        history = open_history()
+        if history is None:
+            return "unknown"
+        with closing(history):
+            estimate = history.estimate()
+    return round(estimate.seconds / 60) if estimate is not None else "unknown"
+
+def query_vars(headset: Union["ZoneHeadset", "DaemonClient"], names: List[str]) -> List[Any]:
+    """Reads each report needed by `names` exactly once, in a single pipelined exchange."""
+    categories = [VAR_MAP[name][0] for name in names]
+    cmd_ids = dict.fromkeys(CATEGORY_REPORTS[c] for c in categories if c in CATEGORY_REPORTS)
+    reports = headset.get_reports(*cmd_ids) if cmd_ids else {}
+    return [
+        battery_eta(headset) if cat_attr == 'history' else
+        getattr(reports[CATEGORY_REPORTS[cat_attr]], VAR_MAP[name][1])
+        for name, cat_attr in zip(names, categories)
+    ]
+
+def parse_settings(pairs: List[List[str]]) -> Tuple[Dict[str, Any], List[Tuple[str, int]]]:
+    """Turns --set VAR VAL pairs into an apply() batch and the (VAR, value) list to report."""
+    settings: Dict[str, Any] = {}
+    ambient: Dict[str, int] = {}
+    applied = []
+    for var_name, val_str in pairs:
+        if var_name not in VAR_MAP:
+            print(f"Error: Unknown variable '{var_name}'")
+            sys.exit(1)
+
+        _, _, write_key = VAR_MAP[var_name]
+        if write_key is None:
+            print(f"Error: Variable '{var_name}' is read-only.")
+            sys.exit(1)
+
+        if val_str.lower() in ['on', 'true']: val_str = '1'
+        if val_str.lower() in ['off', 'false']: val_str = '0'
+
+        try:
+            value = int(val_str)
+        except ValueError:
+            print(f"Error: Value for '{var_name}' must be an integer.")
+            sys.exit(1)
+
+        settings.pop(write_key, None)
+        if write_key == 'ambient_sound':
+            ambient[var_name] = value
+            settings[write_key] = None
+        else:
+            settings[write_key] = value
+        applied.append((var_name, value))
+
+    if ambient:
+        settings['ambient_sound'] = (ambient.get('ambient_level', 20), ambient.get('focus_voice', 0))
+    return settings, applied
+
+def print_status(status: "HeadsetFullStatus") -> None:
+    charge_str = " (Charging)" if status.audio.charging else ""
+
+    print("--- Audio ---")
+    print(f"Volume:             {status.audio.volume}")
+    print(f"Game/Chat Balance:  {status.audio.balance}")
+    print(f"Sidetone:           {status.audio.sidetone}")
+    print(f"Battery Level:      {status.audio.battery_level}%{charge_str}")
+
+    print("\n--- Noise Cancellation ---")
+    print(f"Current Mode:       {format_value(status.nc.nc_mode)}")
+    print(f"Mic Muted:          {format_value(status.nc.mic_muted)}")
+
+    print("\n--- System ---")
+    print(f"Auto Power Off:     {status.system.auto_off_minutes} min")
+    print(f"Notifications:      {format_value(status.system.notif_enabled)}")
+    print(f"Language:           {format_value(status.system.language)}")
+    print(f"Mic Connected:      {format_value(status.system.mic_connected)}")
+    print(f"Bluetooth Conn:     {format_value(status.system.bt_state.connected)}")
+    print(f"Boot Default (NC):  {format_value(status.system.boot_nc)}")
+    print(f"Boot Default (BT):  {format_value(status.system.boot_bt)}")
+
+def format_var(value: Any) -> Any:
+    if isinstance(value, str):
+        return value
+    return value.value if hasattr(value, 'value') else int(value)
+
+def format_stats(snapshot: Dict[str, Any]) -> List[str]:
+    """Summarizes a HeadsetMetrics snapshot; latencies are bucket bounds, so p50/p99 are upper limits."""
+    from .metrics import quantile
+
+    def latency_rows(title: str, histograms: Dict[str, Any], unit: str) -> List[str]:
+        rows = [f"{title} (ms: mean / p50 / p99):"]
+        for name, histogram in sorted(histograms.items()):
+            mean = histogram["sum"] / histogram["count"] * 1e3
+            p50, p99 = (quantile(histogram, q) * 1e3 for q in (0.5, 0.99))
+            rows.append(f"  {name:<14}{histogram['count']:>7} {unit}  {mean:.2f} / <={p50:g} / <={p99:g}")
+        return rows if histograms else [f"{title}: none"]
+
+    lines = latency_rows("Report latency", snapshot["reports"], "reads ")
+    lines += latency_rows("Write acknowledgement latency", snapshot["writes"], "writes")
+    events = ", ".join(f"{name} {count}" for name, count in sorted(snapshot["events"].items()))
+    lines.append(f"Events: {events or 'none'}")
+    lines.append("Counters: " + ", ".join(f"{name} {count}" for name, count in snapshot["counters"].items()))
+    return lines
+
+@contextmanager
+def open_headset(use_daemon: bool = True, transport: Union[str, Any, None] = None,
+                 device: Optional[str] = None, metrics: bool = False,
+                 trace: Optional[str] = None) -> Iterator[Union["ZoneHeadset", "DaemonClient"]]:
+    """Connects through a running zoneoutd if there is one, else opens the device directly.
+
+    The client and device modules are imported here, so `--help` and argument errors
+    never load them, and a daemon-backed query never loads the HID stack. `device`
+    (a transport path or serial number) always opens that transceiver directly;
+    `metrics` enables the directly opened headset's HeadsetMetrics. With `trace`, the
+    device is opened directly and its packets are saved to that file on exit, errors included.
+    A directly opened transceiver feeds its battery readings to the shared battery history.
+    """
+    if use_daemon and transport is None and device is None and trace is None:
+        from .client import DaemonClient
+
+        client = DaemonClient()
+        try:
+            client.connect()
+        except OSError:
+            pass
+        else:
+            with closing(client):
+                yield client
+            return
+    from .device import ZoneHeadset
+
+    path = None
+    if device is not None:
+        from .group import find_headset
+
+        path = find_headset(device, transport)
+    with ZoneHeadset(transport=transport, path=path, metrics=metrics, trace=trace is not None) as headset:
+        if getattr(headset.device, "device_path", None):
+            from .battery import open_history
+
+            headset.battery_history = open_history()
+        try:
+            yield headset
+        finally:
+            if headset.battery_history is not None:
+                headset.battery_history.close()
+            if trace is not None:
+                headset.trace.dump(trace)
+
+def monitor_events(headset: Union["ZoneHeadset", "DaemonClient"], types: Optional[List["EventType"]],
+                   device: Optional[str] = None, transport: Optional[str] = None,
+                   writer: Optional["NdjsonEventWriter"] = None) -> None:
+    """Prints events until interrupted, or hands them to `writer` (notices then go to stderr).
+    A directly opened headset that is unplugged is reopened as soon as it enumerates
+    again, if hotplug uevents are available; a replayed trace returns at its end."""
+    from .client import DaemonClient
+
+    notices = sys.stdout if writer is None else sys.stderr
+    replaying = getattr(getattr(headset, "device", None), "name", None) == "replay"
+
+    watcher = None
+    if not isinstance(headset, DaemonClient) and not replaying:
+        from .hotplug import HotplugWatcher
+
+        watcher = HotplugWatcher()
+        try:
+            watcher.start()
+        except OSError:
+            watcher = None
+
+    def reopen() -> None:
+        if device is not None:
+            from .group import find_headset
+
+            headset.path = find_headset(device, transport)
+        headset.connect()
+
+    try:
+        while True:
+            try:
+                if writer is None:
+                    for event in headset.listen(types=types):
+                        print(f"Event: {event.type.value} -> {format_value(event.value)}")
+                else:
+                    for event in headset.listen(types=types):
+                        writer.write(event)
+                return
+            except DeviceNotFoundError:
+                if replaying:
+                    return
+                if watcher is None:
+                    raise
+            print("Headset disconnected, waiting for it to be plugged back in...", file=notices)
+            if writer is not None:
+                writer.flush()
+            headset.close()
+            watcher.reconnect(reopen)
+            print("Headset reconnected.", file=notices)
+    finally:
+        if watcher is not None:
+            watcher.stop()
+
+def map_group(group: "HeadsetGroup", fn: Callable[["ZoneHeadset"], Any]) -> Tuple[Dict[str, Any], bool]:
+    """Runs `fn` on every headset; prints the failures and returns the other results."""
+    from .exceptions import GroupError
+
+    try:
+        return group.map(fn), True
+    except GroupError as e:
+        for serial, error in e.errors.items():
+            print(f"{serial}: Error: {error}")
+        return e.results, False
+
+def run_all_devices(args: argparse.Namespace) -> bool:
+    """--get-all/--get/--set on every connected headset; returns False if any of them failed."""
+    from .group import HeadsetGroup
+
+    with HeadsetGroup.discover(args.transport, metrics=args.stats) as group:
+        if not group:
+            raise DeviceNotFoundError("No H9 II Headsets found.")
+
+        ok = True
+        if args.get_all:
+            statuses, ok = map_group(group, lambda headset: headset.get_all_data())
+            for serial, status in sorted(statuses.items()):
+                print(f"=== {serial} ({group.headsets[serial].path}) ===")
+                print_status(status)
+                print()
+
+        elif args.get:
+            values, ok = map_group(group, lambda headset: query_vars(headset, args.get))
+            for serial, vals in sorted(values.items()):
+                for val in vals:
+                    print(f"{serial}: {format_var(val)}")
+
+        elif args.set:
+            settings, applied = parse_settings(args.set)
+            done, ok = map_group(group, lambda headset: headset.apply(settings))
+            for serial in sorted(done):
+                for var_name, value in applied:
+                    print(f"{serial}: Set {var_name} -> {value}")
+
+        if args.stats:
+            for serial, headset in sorted(group.headsets.items()):
+                for line in format_stats(headset.metrics.snapshot()):
+                    print(f"{serial}: {line}", file=sys.stderr)
+    return ok
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="ZoneOut: Controller for H9-series Headsets",
@@ -67,79 +367,127 @@ def main() -> None:
         formatter_class=argparse.RawDescriptionHelpFormatter
     )
 
-    group = parser.add_mutually_exclusive_group(required=True)
+    group = parser.add_mutually_exclusive_group()
     group.add_argument('--get-all', action='store_true', help="Read and print all device settings.")
-    group.add_argument('--get', metavar='VAR', choices=VAR_MAP.keys(), help="Get a specific setting value.")
+    group.add_argument('--get', metavar='VAR[,VAR...]', type=parse_var_list,
+                       help="Get one or more setting values (comma-separated), one per line.")
     group.add_argument('--set', nargs=2, action='append', metavar=('VAR', 'VAL'), help="Set a variable (see list below).")
     group.add_argument('--monitor', action='store_true', help="Listen for events in real-time.")
+    group.add_argument('--list-devices', action='store_true',
+                       help="List the connected transceivers with their serial numbers and paths.")
+    parser.add_argument('--stats', action='store_true',
+                        help="Print link statistics (report and write latencies, retries, discarded packets, "
+                             "errors, events) to stderr when done. On its own: zoneoutd's statistics.")
+    parser.add_argument('--only', metavar='TYPE[,TYPE...]', type=parse_event_types,
+                        help="With --monitor: only report these event types (power, volume, balance, "
+                             "nc_mode, mic_muted, mic_connected, bluetooth).")
+    parser.add_argument('--format', choices=['text', 'ndjson'], default='text',
+                        help="With --monitor: 'ndjson' writes one JSON object per event with "
+                             "monotonic and wall-clock timestamps.")
+    parser.add_argument('--flush-interval', metavar='SECONDS', type=float, default=0.1,
+                        help="With --format ndjson: longest time an event is buffered (default: 0.1; "
+                             "0 writes every event at once).")
+    parser.add_argument('--flush-events', metavar='N', type=int, default=256,
+                        help="With --format ndjson: write out once this many events are buffered (default: 256).")
+    parser.add_argument('--no-daemon', action='store_true',
+                        help="Always open the device directly, even if zoneoutd is running.")
+    parser.add_argument('--transport', choices=[*TRANSPORT_NAMES, 'auto'],
+                        help="Open the device directly with this backend "
+                             "(default: $ZONEOUT_TRANSPORT or hidapi; implies --no-daemon).")
+    parser.add_argument('--trace', metavar='FILE',
+                        help="Record every packet exchanged with the device and save them to FILE on exit "
+                             "(implies --no-daemon).")
+    parser.add_argument('--replay', metavar='FILE',
+                        help="Use a trace saved with --trace instead of a device.")
+    parser.add_argument('--replay-speed', metavar='FACTOR', type=float, default=1.0,
+                        help="With --replay: playback speed of the recorded events (default: 1; 0 = as fast as possible).")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument('--device', metavar='SERIAL|PATH',
+                        help="Open this transceiver, by headset serial number or transport path "
+                             "(see --list-devices; implies --no-daemon).")
+    target.add_argument('--all-devices', action='store_true',
+                        help="Run --get-all, --get or --set on every connected headset in parallel; "
+                             "output lines are prefixed with the serial number.")
 
     args = parser.parse_args()
+    action = args.get_all or args.get or args.set or args.monitor or args.list_devices
+    if not action and not args.stats:
+        parser.error("one of the arguments --get-all --get --set --monitor --list-devices --stats is required")
+    if args.only and not args.monitor:
+        parser.error("--only requires --monitor")
+    if args.format != 'text' and not args.monitor:
+        parser.error("--format requires --monitor")
+    if args.replay and (args.transport or args.device or args.all_devices):
+        parser.error("--replay cannot be combined with --transport, --device or --all-devices")
+    if args.all_devices and not (args.get_all or args.get or args.set):
+        parser.error("--all-devices works with --get-all, --get and --set")
 
     try:
-        with ZoneHeadset() as headset:
-            if args.get_all:
-                status = headset.get_all_data()
+        if args.list_devices:
+            from .group import enumerate_headsets
 
-                charge_str = " (Charging)" if status.audio.charging else ""
+            for info in enumerate_headsets(args.transport):
+                print(f"{info.serial}\t{info.path}")
+            return
 
-                print("--- Audio ---")
-                print(f"Volume:             {status.audio.volume}")
-                print(f"Game/Chat Balance:  {status.audio.balance}")
-                print(f"Sidetone:           {status.audio.sidetone}")
-                print(f"Battery Level:      {status.audio.battery_level}%{charge_str}")
+        if args.all_devices:
+            if not run_all_devices(args):
+                sys.exit(1)
+            return
 
-                print("\n--- Noise Cancellation ---")
-                print(f"Current Mode:       {format_value(status.nc.nc_mode)}")
-                print(f"Mic Muted:          {format_value(status.nc.mic_muted)}")
+        transport = args.transport
+        if args.replay:
+            from .trace import ReplayTransport
 
-                print("\n--- System ---")
-                print(f"Auto Power Off:     {status.system.auto_off_minutes} min")
-                print(f"Notifications:      {format_value(status.system.notif_enabled)}")
-                print(f"Language:           {format_value(status.system.language)}")
-                print(f"Mic Connected:      {format_value(status.system.mic_connected)}")
-                print(f"Bluetooth Conn:     {format_value(status.system.bt_state.connected)}")
-                print(f"Boot Default (NC):  {format_value(status.system.boot_nc)}")
-                print(f"Boot Default (BT):  {format_value(status.system.boot_bt)}")
+            transport = ReplayTransport(args.replay, args.replay_speed or None, stop_at_end=bool(args.monitor))
+        with open_headset(not args.no_daemon, transport, args.device, args.stats, args.trace) as headset:
+            if not action:
+                if not hasattr(headset, "stats"):
+                    print("Error: --stats on its own shows zoneoutd's statistics, but it is not running. "
+                          "Combine --stats with an action instead.")
+                    sys.exit(1)
+                print("\n".join(format_stats(headset.stats())))
+                return
+
+            if args.get_all:
+                print_status(headset.get_all_data())
 
             elif args.get:
-                status = headset.get_all_data()
-                cat_attr, field_name, _ = VAR_MAP[args.get]
-                category = getattr(status, cat_attr)
-                val = getattr(category, field_name)
-                print(val.value if hasattr(val, 'value') else int(val))
+                for val in query_vars(headset, args.get):
+                    print(format_var(val))
 
             elif args.set:
-                for var_name, val_str in args.set:
-                    if var_name not in VAR_MAP:
-                        print(f"Error: Unknown variable '{var_name}'")
-                        sys.exit(1)
-
-                    _, _, setter_name = VAR_MAP[var_name]
-                    if setter_name is None:
-                        print(f"Error: Variable '{var_name}' is read-only.")
-                        sys.exit(1)
-
-                    if val_str.lower() in ['on', 'true']: val_str = '1'
-                    if val_str.lower() in ['off', 'false']: val_str = '0'
-
-                    try:
-                        value = int(val_str)
-                    except ValueError:
-                        print(f"Error: Value for '{var_name}' must be an integer.")
-                        sys.exit(1)
-
-                    getattr(headset, setter_name)(value)
+                settings, applied = parse_settings(args.set)
+                headset.apply(settings)
+                for var_name, value in applied:
                     print(f"Set {var_name} -> {value}")
 
+            elif args.monitor and args.format == 'ndjson':
+                from .ndjson import NdjsonEventWriter
+
+                # A terminal gets every line at once; pipes and files get batched writes.
+                interval = 0 if sys.stdout.isatty() else args.flush_interval
+                try:
+                    with NdjsonEventWriter(sys.stdout.buffer, interval, args.flush_events) as writer:
+                        try:
+                            monitor_events(headset, args.only, args.device, args.transport, writer)
+                        except KeyboardInterrupt:
+                            pass
+                except BrokenPipeError:
+                    # The reader went away (e.g. `| head`); silence the flush at exit.
+                    os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+
             elif args.monitor:
                 print("Listening for headset events (Ctrl+C to stop)...")
                 try:
-                    for event in headset.listen():
-                        val_str = format_value(event.value)
-                        print(f"Event: {event.type.value} -> {val_str}")
+                    monitor_events(headset, args.only, args.device, args.transport)
                 except KeyboardInterrupt:
                     print("\nStopped.")
 
+            if args.stats:
+                snapshot = headset.stats() if hasattr(headset, "stats") else headset.metrics.snapshot()
+                print("\n".join(format_stats(snapshot)), file=sys.stderr)
+
     except DeviceNotFoundError as e:
         print(f"Error: {e}")
         if e.__cause__:
@@ -0,0 +1,150 @@
+import json
+import os
+import socket
+from dataclasses import fields, is_dataclass
+from typing import Any, Dict, Generator, Iterable, Mapping, Optional, Tuple, Union
+
+from . import protocol
+from .arbiter import runtime_path
+from .cache import CachedReport
+from .exceptions import ZoneError, DeviceNotFoundError, ProtocolError
+from .models import (
+    AudioStatus, NcStatus, SystemStatus, HeadsetFullStatus, HeadsetEvent, EventType,
+    PowerState, BluetoothState, NcMode
+)
+
+
+REPORT_MODELS: Dict[int, type] = {
+    protocol.REQ_POWER_STATUS: PowerState,
+    protocol.REQ_AUDIO_STATUS: AudioStatus,
+    protocol.REQ_NC_STATUS: NcStatus,
+    protocol.REQ_SYSTEM_STATUS: SystemStatus,
+}
+
+EVENT_VALUE_TYPES: Dict[EventType, type] = {
+    EventType.POWER: PowerState,
+    EventType.VOLUME: int,
+    EventType.BALANCE: int,
+    EventType.NC_MODE: NcMode,
+    EventType.MIC_MUTE: bool,
+    EventType.MIC_CONN: bool,
+    EventType.BLUETOOTH: BluetoothState,
+}
+
+_ERRORS: Dict[str, type] = {cls.__name__: cls for cls in (ZoneError, DeviceNotFoundError, ProtocolError)}
+
+
+def socket_path() -> str:
+    """$ZONEOUT_SOCKET, else zoneout.sock in $XDG_RUNTIME_DIR, else a per-user file in /tmp."""
+    path = os.environ.get("ZONEOUT_SOCKET")
+    if path:
+        return path
+    return runtime_path(".sock")
+
+
+def pack(value: Any) -> Any:
+    """Flattens a model into nested lists of ints for the wire."""
+    if is_dataclass(value):
+        return [pack(getattr(value, f.name)) for f in fields(value)]
+    return int(value)
+
+
+def unpack(kind: Any, data: Any) -> Any:
+    """Inverse of pack(), driven by the model's field types."""
+    if is_dataclass(kind):
+        return kind(*(unpack(f.type, v) for f, v in zip(fields(kind), data)))
+    return kind(data)
+
+
+class DaemonClient:
+    """Talks to a running zoneoutd; offers the read/write/listen subset of ZoneHeadset."""
+
+    def __init__(self, path: Optional[str] = None, timeout: float = 2.0) -> None:
+        self.path = path or socket_path()
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._file: Optional[Any] = None
+
+    def connect(self) -> None:
+        """Raises OSError (e.g. FileNotFoundError, ConnectionRefusedError) when no daemon is listening."""
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.path)
+        except OSError:
+            sock.close()
+            raise
+        self._sock = sock
+        self._file = sock.makefile("rb")
+
+    def close(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
+        if self._sock:
+            self._sock.close()
+            self._sock = None
+
+    def __enter__(self) -> "DaemonClient":
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _read_reply(self) -> Any:
+        line = self._file.readline().decode()
+        if not line:
+            raise DeviceNotFoundError("zoneoutd closed the connection")
+        status, _, payload = line.rstrip("\n").partition(" ")
+        if status == "err":
+            kind, _, message = payload.partition(" ")
+            raise _ERRORS.get(kind, ZoneError)(message)
+        return json.loads(payload) if payload else None
+
+    def _request(self, verb: str, arg: str = "") -> Any:
+        if not self._sock:
+            raise DeviceNotFoundError("Daemon not connected")
+        try:
+            self._sock.sendall(f"{verb} {arg}\n".encode())
+            return self._read_reply()
+        except socket.timeout:
+            raise ProtocolError(f"Timeout waiting for zoneoutd ({verb})") from None
+
+    def read_reports(self, *cmd_ids: int, fresh: bool = False) -> Dict[int, CachedReport]:
+        """Reports from the daemon's cache, tagged with their age; `fresh=True` forces a device read."""
+        arg = ",".join(str(c) for c in cmd_ids) + (" fresh" if fresh else "")
+        return {
+            cmd_id: CachedReport(unpack(REPORT_MODELS[cmd_id], data), age)
+            for cmd_id, (data, age) in zip(cmd_ids, self._request("reports", arg))
+        }
+
+    def get_reports(self, *cmd_ids: int, fresh: bool = False) -> Dict[int, Any]:
+        return {cmd_id: report.value for cmd_id, report in self.read_reports(*cmd_ids, fresh=fresh).items()}
+
+    def get_all_data(self, fresh: bool = False) -> HeadsetFullStatus:
+        reports = self.get_reports(
+            protocol.REQ_AUDIO_STATUS, protocol.REQ_NC_STATUS, protocol.REQ_SYSTEM_STATUS, fresh=fresh
+        )
+        return HeadsetFullStatus(
+            audio=reports[protocol.REQ_AUDIO_STATUS],
+            nc=reports[protocol.REQ_NC_STATUS],
+            system=reports[protocol.REQ_SYSTEM_STATUS]
+        )
+
+    def apply(self, settings: Mapping[str, Union[int, Tuple[int, ...]]]) -> None:
+        self._request("apply", json.dumps(dict(settings), separators=(",", ":")))
+
+    def stats(self) -> Dict[str, Any]:
+        """The daemon's HeadsetMetrics snapshot."""
+        return self._request("stats")
+
+    def listen(self, types: Optional[Iterable[EventType]] = None) -> Generator[HeadsetEvent, None, None]:
+        """Yields events forwarded by the daemon, optionally only those of the given `types`."""
+        self._request("subscribe", ",".join(t.value for t in types) if types else "")
+        self._sock.settimeout(None)
+        for raw in self._file:
+            _, name, payload = raw.decode().split(" ", 2)
+            event_type = EventType(name)
+            yield HeadsetEvent.interned(event_type, unpack(EVENT_VALUE_TYPES[event_type], json.loads(payload)))
+        raise DeviceNotFoundError("zoneoutd closed the connection")
@@ -0,0 +1,252 @@
+import argparse
+import json
+import os
+import queue
+import select
+import signal
+import socket
+import socketserver
+import sys
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from . import protocol
+from .client import pack, socket_path
+from .exceptions import ZoneError, DeviceNotFoundError, ProtocolError
+from .transport import TRANSPORT_NAMES
+from .models import EventType
+
+if TYPE_CHECKING:
+    from .device import ZoneHeadset
+
+
+ALL_REPORTS: Tuple[int, ...] = (
+    protocol.REQ_POWER_STATUS, protocol.REQ_AUDIO_STATUS,
+    protocol.REQ_NC_STATUS, protocol.REQ_SYSTEM_STATUS,
+)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """One client connection: newline-terminated `<verb> <argument>` requests,
+    answered with `ok [<json>]` or `err <ErrorClass> <message>`."""
+
+    server: "_Server"
+
+    def handle(self) -> None:
+        for raw in self.rfile:
+            verb, _, arg = raw.decode("utf-8", "replace").strip().partition(" ")
+            if not verb:
+                continue
+            try:
+                if verb == "subscribe":
+                    self._stream_events(arg)
+                    return
+                result = self.server.zone.request(verb, arg)
+                reply = "ok" if result is None else "ok " + json.dumps(result, separators=(",", ":"))
+            except ZoneError as e:
+                reply = f"err {type(e).__name__} {e}"
+            except (ValueError, TypeError, KeyError) as e:
+                reply = f"err ProtocolError Bad request: {e}"
+            try:
+                self.wfile.write(reply.encode() + b"\n")
+            except OSError:
+                return
+
+    def _stream_events(self, arg: str) -> None:
+        wanted = frozenset(EventType(name) for name in arg.split(",")) if arg else None
+        events = self.server.zone.subscribe(wanted)
+        try:
+            self.wfile.write(b"ok\n")
+            while True:
+                try:
+                    line = events.get(timeout=1.0)
+                except queue.Empty:
+                    if select.select([self.connection], [], [], 0)[0]:
+                        return
+                    continue
+                if line is None:
+                    return
+                self.wfile.write(line)
+        except OSError:
+            pass
+        finally:
+            self.server.zone.unsubscribe(events)
+
+
+class _Server(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+    zone: "ZoneDaemon"
+
+
+class ZoneDaemon:
+    """Serves one open ZoneHeadset to local clients over a Unix socket.
+
+    The headset should be created with `cache=True`: reads are then answered from its
+    StatusCache, seeded at startup and kept current by events, and writes invalidate
+    the reports they affect.
+    """
+
+    def __init__(self, headset: "ZoneHeadset", path: Optional[str] = None) -> None:
+        self.headset = headset
+        self.path = path or socket_path()
+        self.error: Optional[BaseException] = None
+        self._subscribers: Dict[queue.SimpleQueue, Optional[frozenset]] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[_Server] = None
+
+    def request(self, verb: str, arg: str) -> Any:
+        if verb == "reports":
+            ids, _, mode = arg.partition(" ")
+            cmd_ids = [int(c, 0) for c in ids.split(",")]
+            reports = self.headset.read_reports(*cmd_ids, fresh=(mode == "fresh"))
+            return [[pack(reports[cmd_id].value), round(reports[cmd_id].age, 3)] for cmd_id in cmd_ids]
+        if verb == "apply":
+            settings = {key: tuple(v) if isinstance(v, list) else v for key, v in json.loads(arg).items()}
+            self.headset.apply(settings)
+            return None
+        if verb == "stats":
+            if self.headset.metrics is None:
+                raise ProtocolError("Metrics are not enabled")
+            return self.headset.metrics.snapshot()
+        raise ProtocolError(f"Unknown request: {verb}")
+
+    def subscribe(self, types: Optional[frozenset]) -> queue.SimpleQueue:
+        events: queue.SimpleQueue = queue.SimpleQueue()
+        with self._lock:
+            self._subscribers[events] = types
+        return events
+
+    def unsubscribe(self, events: queue.SimpleQueue) -> None:
+        with self._lock:
+            self._subscribers.pop(events, None)
+
+    def _pump_events(self) -> None:
+        try:
+            for event in self.headset.listen():
+                line = f"event {event.type.value} {json.dumps(pack(event.value))}\n".encode()
+                with self._lock:
+                    for events, types in self._subscribers.items():
+                        if types is None or event.type in types:
+                            events.put(line)
+        except DeviceNotFoundError as e:
+            self.error = e
+        finally:
+            with self._lock:
+                for events in self._subscribers:
+                    events.put(None)
+            if self._server:
+                self._server.shutdown()
+
+    def _bind(self) -> _Server:
+        if os.path.exists(self.path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.path)
+            except OSError:
+                os.unlink(self.path)
+            else:
+                raise ZoneError(f"zoneoutd is already running on {self.path}")
+            finally:
+                probe.close()
+        old_umask = os.umask(0o177)
+        try:
+            server = _Server(self.path, _Handler)
+        finally:
+            os.umask(old_umask)
+        server.zone = self
+        return server
+
+    def serve_forever(self) -> None:
+        """Runs until the headset disconnects or shutdown() is called; removes the socket afterwards."""
+        self._server = self._bind()
+        try:
+            threading.Thread(target=self._pump_events, name="zoneoutd-events", daemon=True).start()
+            self.headset.read_reports(*ALL_REPORTS)
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+    def shutdown(self) -> None:
+        if self._server:
+            self._server.shutdown()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="ZoneOut daemon: keeps the headset open for zoneout clients")
+    parser.add_argument('--socket', metavar='PATH', help=f"Unix socket to listen on (default: {socket_path()}).")
+    parser.add_argument('--transport', choices=[*TRANSPORT_NAMES, 'auto'],
+                        help="HID backend (default: $ZONEOUT_TRANSPORT or hidapi).")
+    parser.add_argument('--device', metavar='SERIAL|PATH',
+                        help="Serve this transceiver, by headset serial number or transport path "
+                             "(default: the first one found).")
+    parser.add_argument('--exit-on-disconnect', action='store_true',
+                        help="Exit when the headset is unplugged instead of waiting for it to come back.")
+    parser.add_argument('--metrics-file', metavar='PATH',
+                        help="Rewrite this Prometheus textfile with the device metrics "
+                             "(e.g. for the node_exporter textfile collector).")
+    parser.add_argument('--metrics-interval', metavar='SECONDS', type=float, default=15.0,
+                        help="How often --metrics-file is rewritten (default: 15).")
+    parser.add_argument('--battery-history', metavar='PATH',
+                        help="Record battery readings in this history file "
+                             "(default: $XDG_DATA_HOME/zoneout/battery.hist).")
+    args = parser.parse_args(argv)
+
+    from .battery import open_history
+    from .device import ZoneHeadset
+    from .group import find_headset
+    from .hotplug import HotplugWatcher
+    from .metrics import HeadsetMetrics, TextfileExporter
+
+    # One set of metrics across reconnects, so the exported counters never go backwards.
+    metrics = HeadsetMetrics()
+    history = open_history(args.battery_history)
+
+    def serve() -> Optional[BaseException]:
+        path = find_headset(args.device, args.transport) if args.device else None
+        with ZoneHeadset(cache=True, transport=args.transport, path=path, metrics=metrics) as headset:
+            # Only a real transceiver feeds the history, not the simulator.
+            if getattr(headset.device, "device_path", None):
+                headset.battery_history = history
+            daemon = ZoneDaemon(headset, args.socket)
+            daemon.serve_forever()
+        return daemon.error
+
+    exporter: Optional[TextfileExporter] = None
+    if args.metrics_file:
+        exporter = TextfileExporter(metrics, args.metrics_file, args.metrics_interval)
+        exporter.start()
+
+    watcher: Optional[HotplugWatcher] = None
+    if not args.exit_on_disconnect:
+        watcher = HotplugWatcher()
+        try:
+            watcher.start()
+        except OSError:
+            watcher = None
+
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        error = watcher.reconnect(serve) if watcher is not None else serve()
+        while error is not None:
+            if watcher is None:
+                raise error
+            print("Headset disconnected, waiting for it to be plugged back in...", flush=True)
+            error = watcher.reconnect(serve)
+    except KeyboardInterrupt:
+        pass
+    except ZoneError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    finally:
+        if watcher is not None:
+            watcher.stop()
+        if exporter is not None:
+            exporter.stop()
+        if history is not None:
+            history.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+import struct
+from enum import Enum
+from operator import getitem, itemgetter
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from . import protocol
+from .exceptions import ProtocolError
+from .models import (
+    AudioStatus, DeviceInfo, NcStatus, SystemStatus, PowerState, BluetoothState, HeadsetEvent, EventType,
+    NcMode, BootNcMode, BootBtMode, Language
+)
+
+
+# (field, byte offset, struct format, converter): the converter is None for plain values,
+# an Enum class (decoded through a precomputed lookup table) or any callable.
+Field = Tuple[str, int, str, Any]
+
+
+def _system_status(boot_nc, boot_bt, bt_enabled, bt_connected, auto_off_minutes,
+                   language, notif_enabled, mic_connected) -> SystemStatus:
+    return SystemStatus(
+        boot_nc, boot_bt, BluetoothState.interned(bt_enabled, bt_connected),
+        auto_off_minutes, language, notif_enabled, mic_connected
+    )
+
+
+# Byte layouts of the status report responses (see SPECS.md, "Response Decoding").
+# Fields are listed in the factory's parameter order and passed positionally.
+REPORT_LAYOUTS: Dict[int, Tuple[Callable[..., Any], Sequence[Field]]] = {
+    protocol.REQ_POWER_STATUS: (PowerState.interned, (
+        ('charging',         13, '?', None),
+        ('battery_level',    14, 'B', None),
+    )),
+    protocol.REQ_AUDIO_STATUS: (AudioStatus, (
+        ('volume',           17, 'B', None),
+        ('balance',          19, 'B', None),
+        ('sidetone',         20, 'B', None),
+        ('battery_level',    15, 'B', None),
+        ('charging',         14, '?', None),
+    )),
+    protocol.REQ_NC_STATUS: (NcStatus, (
+        ('nc_mode',          16, 'B', NcMode),
+        ('mic_muted',        13, '?', None),
+        ('ambient_level',    17, 'B', None),
+        ('focus_on_voice',   19, '?', None),
+    )),
+    protocol.REQ_SYSTEM_STATUS: (_system_status, (
+        ('boot_nc',          13, 'B', BootNcMode),
+        ('boot_bt',          17, 'B', BootBtMode),
+        ('bt_enabled',       14, '?', None),
+        ('bt_connected',     15, 'B', (1).__eq__),
+        ('auto_off_minutes', 18, 'B', None),
+        ('language',         21, 'B', Language),
+        ('notif_enabled',    22, 'B', (1).__eq__),
+        ('mic_connected',    24, 'B', (0).__eq__),
+    )),
+}
+
+
+# Payload layouts of the asynchronous events (see SPECS.md, "Event Table"), keyed by event CMD.
+# Without a factory, the single field's converted value is the event value.
+EVENT_LAYOUTS: Dict[int, Tuple[EventType, Optional[Callable[..., Any]], Sequence[Field]]] = {
+    protocol.EVT_POWER: (EventType.POWER, PowerState.interned, (
+        ('charging',         13, '?', None),
+        ('battery_level',    14, 'B', None),
+    )),
+    protocol.EVT_VOL_CHANGED: (EventType.VOLUME, None, (
+        ('volume',           14, 'B', None),
+    )),
+    protocol.EVT_BAL_CHANGED: (EventType.BALANCE, None, (
+        ('balance',          13, 'B', None),
+    )),
+    protocol.EVT_NC_CHANGED: (EventType.NC_MODE, None, (
+        ('nc_mode',          13, 'B', NcMode),
+    )),
+    protocol.EVT_MIC_MUTE: (EventType.MIC_MUTE, None, (
+        ('mic_muted',        13, '?', None),
+    )),
+    protocol.EVT_MIC_CONN: (EventType.MIC_CONN, None, (
+        ('mic_connected',    13, 'B', (0).__eq__),
+    )),
+    protocol.EVT_BT_STATE: (EventType.BLUETOOTH, BluetoothState.interned, (
+        ('enabled',          13, '?', None),
+        ('connected',        14, '?', None),
+    )),
+}
+
+
+_BYTES = range(256)
+_DECODED_LIMIT = 4096
+
+
+def _table(code: str, conv: Any) -> Any:
+    """Decoded value of every possible byte of a field, indexed by the byte.
+
+    Enum fields get a dict holding only the defined values, so anything else raises KeyError.
+    """
+    if code == "B" and conv is None:
+        return _BYTES
+    raw = _BYTES if code == "B" else [byte != 0 for byte in _BYTES]
+    if isinstance(conv, type) and issubclass(conv, Enum):
+        members = {member.value: member for member in conv}
+        return {byte: members[value] for byte, value in zip(_BYTES, raw) if value in members}
+    return tuple(raw if conv is None else map(conv, raw))
+
+
+def make_decoder(cmd_id: int, factory: Optional[Callable[..., Any]], fields: Sequence[Field],
+                 event_type: Optional[EventType] = None) -> Tuple[Callable[[Any], Any], Callable[[List[int]], Any]]:
+    """Builds the two decoders of one layout.
+
+    The first takes any buffer supported by struct.unpack_from (one precompiled unpack),
+    the second picks the fields out of the list of ints hidapi returns with a precompiled
+    itemgetter; neither copies the packet. Fields are single bytes, so each converter is
+    precomputed into a lookup table, and decoded values are memoized by their raw field
+    bytes. With `event_type`, the decoded value is wrapped in an interned HeadsetEvent.
+    """
+    if factory is None and len(fields) != 1:
+        raise ValueError("Layouts without a factory must have exactly one field")
+    by_offset = sorted(range(len(fields)), key=lambda i: fields[i][1])
+    fmt = "<"
+    pos = 0
+    for i in by_offset:
+        name, offset, code, _ = fields[i]
+        if offset < pos:
+            raise ValueError(f"Field {name} overlaps another field at byte {offset}")
+        if code not in ("B", "?"):
+            raise ValueError(f"Field {name}: unsupported format {code!r}")
+        # Raw bytes on both paths; the tables turn '?' fields into bools.
+        fmt += "x" * (offset - pos) + "B"
+        pos = offset + 1
+    unpack = struct.Struct(fmt).unpack_from
+    # Both getters yield the raw fields in layout order, as a bare value for a single field.
+    get = itemgetter(*(offset for _, offset, _, _ in fields))
+    pick = itemgetter(*(by_offset.index(i) for i in range(len(fields))))
+    converters = [_table(code, conv) for _, _, code, conv in fields]
+    single = len(fields) == 1
+    kind = "Report" if event_type is None else "Event"
+    # The headset only ever reports a handful of states and the models are frozen, so a
+    # repeated state is one dict lookup instead of conversions and a factory call.
+    decoded: Dict[Any, Any] = {}
+
+    def build(raw: Any) -> Any:
+        try:
+            if single:
+                value = converters[0][raw]
+                if factory is not None:
+                    value = factory(value)
+            else:
+                value = factory(*map(getitem, converters, raw))
+        except KeyError as e:
+            raise ProtocolError(f"Unexpected value {e} in {kind} CMD {hex(cmd_id)}") from None
+        if event_type is not None:
+            value = HeadsetEvent.interned(event_type, value)
+        if len(decoded) < _DECODED_LIMIT:
+            decoded[raw] = value
+        return value
+
+    def decode_buffer(buf: Any) -> Any:
+        raw = pick(unpack(buf))
+        value = decoded.get(raw)
+        return build(raw) if value is None else value
+
+    def decode_list(buf: List[int]) -> Any:
+        raw = get(buf)
+        value = decoded.get(raw)
+        return build(raw) if value is None else value
+
+    return decode_buffer, decode_list
+
+
+_REPORT_PAIRS = {cmd_id: make_decoder(cmd_id, factory, fields) for cmd_id, (factory, fields) in REPORT_LAYOUTS.items()}
+
+REPORT_DECODERS: Dict[int, Callable[[Any], Any]] = {cmd_id: pair[0] for cmd_id, pair in _REPORT_PAIRS.items()}
+_LIST_DECODERS: Dict[int, Callable[[List[int]], Any]] = {cmd_id: pair[1] for cmd_id, pair in _REPORT_PAIRS.items()}
+
+SERIAL_OFFSET = 13
+
+
+def _device_info(buf: Any) -> DeviceInfo:
+    """The Device Info report carries the serial number as NUL-terminated ASCII."""
+    serial = bytes(buf[SERIAL_OFFSET:]).split(b"\0", 1)[0]
+    return DeviceInfo.interned(serial.decode("ascii", "replace").strip())
+
+
+REPORT_DECODERS[protocol.REQ_DEVICE_INFO] = _LIST_DECODERS[protocol.REQ_DEVICE_INFO] = _device_info
+
+_EVENT_PAIRS = {
+    cmd_id: make_decoder(cmd_id, factory, fields, event_type)
+    for cmd_id, (event_type, factory, fields) in EVENT_LAYOUTS.items()
+}
+
+EVENT_DECODERS: Dict[int, Callable[[Any], HeadsetEvent]] = {cmd: pair[0] for cmd, pair in _EVENT_PAIRS.items()}
+_LIST_EVENT_DECODERS: Dict[int, Callable[[List[int]], HeadsetEvent]] = {
+    cmd: pair[1] for cmd, pair in _EVENT_PAIRS.items()
+}
+
+EVENT_CMDS: Dict[EventType, int] = {event_type: cmd for cmd, (event_type, _, _) in EVENT_LAYOUTS.items()}
+
+
+def decode_report(cmd_id: int, buf: Any) -> Any:
+    """Decodes a report response; `buf` may be bytes, bytearray, memoryview or a list of ints."""
+    decoder = (_LIST_DECODERS if type(buf) is list else REPORT_DECODERS).get(cmd_id)
+    if decoder is None:
+        raise ProtocolError(f"No decoder for Report CMD {hex(cmd_id)}")
+    return decoder(buf)
+
+
+def decode_reports(packets: Iterable[Any]) -> Iterator[Tuple[int, Any]]:
+    """Bulk-decodes recorded packets, yielding (cmd_id, status) for every known report response."""
+    for buf in packets:
+        if len(buf) < 64 or protocol.is_event(buf):
+            continue
+        decoder = (_LIST_DECODERS if type(buf) is list else REPORT_DECODERS).get(buf[9])
+        if decoder is not None:
+            yield buf[9], decoder(buf)
+
+
+def event_cmds(types: Optional[Iterable[EventType]]) -> Optional[FrozenSet[int]]:
+    """Maps an event type filter to the raw CMD bytes it accepts (None accepts everything)."""
+    if types is None:
+        return None
+    return frozenset(EVENT_CMDS[t] for t in types)
+
+
+def decode_event(buf: Any) -> Optional[HeadsetEvent]:
+    """Decodes an event packet; returns None for anything that is not a known event."""
+    if not protocol.is_event(buf):
+        return None
+    decoder = (_LIST_EVENT_DECODERS if type(buf) is list else EVENT_DECODERS).get(buf[9])
+    return decoder(buf) if decoder is not None else None
@@ -1,37 +1,217 @@
-from typing import Generator, Optional, List, Any, Union, Tuple
-
-import hid
+import queue
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from functools import partial
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Callable, ContextManager, Deque, Dict, FrozenSet, Generator, Iterable, Optional, List, Any, Mapping, Sequence, Union, Tuple
 
 from . import protocol
+from .arbiter import DeviceArbiter
+from .battery import BatteryEstimate, BatteryHistory
+from .cache import CachedReport, StatusCache, EVENT_FIELDS, WRITE_REPORTS
+from .decoders import decode_event, decode_report, event_cmds
 from .exceptions import DeviceNotFoundError, ProtocolError
+from .metrics import HeadsetMetrics
+from .trace import PacketTrace, TracingTransport
+from .reactor import DISCONNECTED, HidReactor
+from .transport import create_transport
 from .models import (
-    AudioStatus, NcStatus, SystemStatus, HeadsetFullStatus,
-    HeadsetEvent, BluetoothState, NcMode, BootNcMode, BootBtMode,
-    Language, EventType, PowerState
+    AudioStatus, DeviceInfo, NcStatus, SystemStatus, HeadsetFullStatus,
+    HeadsetEvent, EventType, PowerState, changed_fields
 )
 
 
-class ZoneHeadset:
+# Reports re-read by resync(), by HeadsetFullStatus attribute: audio and NC first, as the
+# headset's own controls change them, then the system report.
+RESYNC_PHASES: Tuple[Tuple[Tuple[str, int], ...], ...] = (
+    (('audio', protocol.REQ_AUDIO_STATUS), ('nc', protocol.REQ_NC_STATUS)),
+    (('system', protocol.REQ_SYSTEM_STATUS),),
+)
+
+
+def _open_device(transport: Union[str, Any, None] = None, path: Optional[str] = None) -> Any:
+    device = create_transport(transport, path)
+    try:
+        device.open()
+        return device
+    except Exception as e:
+        where = f"at {path}" if path is not None else f"({hex(protocol.VENDOR_ID)}:{hex(protocol.PRODUCT_ID)})"
+        raise DeviceNotFoundError(
+            f"Could not open H9 II Headset {where}. "
+            f"Check USB connection and permissions (udev rules)."
+        ) from e
+
+
+def _clamp(setting_key: str, value: Union[int, Tuple[int, ...]]) -> Union[int, Tuple[int, ...]]:
+    if setting_key not in protocol.WRITE_LIMITS:
+        raise ProtocolError(f"Unknown setting key: {setting_key}")
+    limits = protocol.WRITE_LIMITS[setting_key]
+    if isinstance(limits[0], tuple):
+        if not isinstance(value, (tuple, list)) or len(value) != len(limits):
+            raise ProtocolError(f"Value mismatch for multi-write key {setting_key}")
+        return tuple(max(lo, min(hi, int(v))) for v, (lo, hi) in zip(value, limits))
+    lo, hi = limits
+    return max(lo, min(hi, int(value)))
+
+
+def _encode_settings(items: Sequence[Tuple[str, Union[int, Tuple[int, ...]]]], seq: int,
+                     buffers: Dict[str, bytearray]) -> Tuple[List[Tuple[str, bytearray]], int]:
+    """Encodes writes with consecutive sequence numbers into per-key reusable buffers.
+
+    Returns the packets and the next sequence number; nothing is sent, so a bad item
+    leaves both the device and the caller's counter untouched.
+    """
+    packets = []
+    for setting_key, value in items:
+        encoder = protocol.WRITE_ENCODERS.get(setting_key)
+        if encoder is None:
+            raise ProtocolError(f"Unknown setting key: {setting_key}")
+        buf = buffers.get(setting_key)
+        if buf is None:
+            buf = buffers[setting_key] = encoder.new_buffer()
+        elif packets and any(buf is used for _, used in packets):
+            buf = encoder.new_buffer()
+        packets.append((setting_key, encoder.encode_into(buf, value, seq)))
+        seq = (seq + 1) if seq < 255 else 1
+    return packets, seq
+
+
+class StopToken:
+    """Cancels ZoneHeadset.listen() from another thread.
+
+    set() runs the callbacks listen() registered, which interrupt its pending read
+    right away instead of letting it time out.
+    """
+
     def __init__(self) -> None:
+        self._event = threading.Event()
+        self._callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def set(self) -> None:
+        # Callbacks run under the lock, so none is still pending once remove_callback() returns.
+        with self._lock:
+            self._event.set()
+            for callback in self._callbacks:
+                callback()
+
+    def is_set(self) -> bool:
+        return self._event.is_set()
+
+    def add_callback(self, callback: Callable[[], None]) -> None:
+        """Registers `callback` for set(); it runs immediately if the token is already set."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def remove_callback(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+
+class ZoneHeadset:
+    def __init__(self, reactor: bool = False, ack_timeout: float = 0.25, wait_for_ack: bool = True,
+                 cache: bool = False, cache_ttl: Optional[Mapping[str, Optional[float]]] = None,
+                 transport: Union[str, Any, None] = None, path: Optional[str] = None,
+                 arbitrate: bool = True, arbitration_timeout: float = 1.0,
+                 metrics: Union[bool, HeadsetMetrics] = False, trace: Union[bool, PacketTrace] = False,
+                 battery_history: Optional[BatteryHistory] = None) -> None:
+        """With `reactor=True`, a background HidReactor owns all reads on the handle,
+        so listen() and concurrent queries/setters from other threads never steal
+        each other's packets.
+
+        Setters return once the device acknowledges the write's sequence number and raise
+        ProtocolError after `ack_timeout` seconds; `wait_for_ack=False` makes them
+        fire-and-forget.
+
+        `cache=True` (implies the reactor) serves reads from a StatusCache kept current by
+        the device events; fields without events expire per `cache_ttl` and only the
+        report holding them is re-read. Pass `fresh=True` to a getter to bypass it.
+
+        `transport` is a transport name ('hidapi', 'hidraw', 'auto') or instance, see
+        zoneout.transport; by default $ZONEOUT_TRANSPORT or hidapi. `path` opens one specific
+        transceiver (see zoneout.group.enumerate_headsets); by default the first one found.
+
+        With `arbitrate` (the default), every request/response exchange and write batch on
+        a hidapi or hidraw device takes a turn from a DeviceArbiter shared by all processes
+        using that device, in FIFO order, and sequence numbers come from its shared
+        counter; waiting longer than `arbitration_timeout` seconds raises DeviceBusyError.
+
+        `metrics=True` records report and write latencies, retries, discarded packets,
+        protocol errors and events in `self.metrics`, a new HeadsetMetrics; pass an
+        instance to keep counting across headsets or reconnects. Otherwise it is None and
+        nothing is recorded.
+
+        `trace=True` (or a PacketTrace) records every packet written and read, with its
+        direction and time, in the ring buffer `self.trace`; trace.dump(path) saves it
+        for zoneout.trace.ReplayTransport.
+
+        With an open `battery_history`, the battery level and charging state of every
+        power or audio report read and POWER event delivered are appended to it (nothing
+        extra is polled); battery_estimate() projects the time remaining from it."""
         self.device: Optional[Any] = None
-        self.seq: int = 1  
+        self.seq: int = 1
+        self.ack_timeout = ack_timeout
+        self.wait_for_ack = wait_for_ack
+        self._backlog: Deque[List[int]] = deque(maxlen=256)
+        self._write_buffers: Dict[str, bytearray] = {}
+        self.use_reactor = reactor or cache
+        self._reactor: Optional[HidReactor] = None
+        self._lock = threading.Lock()
+        self.cache: Optional[StatusCache] = StatusCache(cache_ttl) if cache else None
+        self._cache_events: Optional[queue.Queue] = None
+        self._cache_lock = threading.Lock()
+        self.transport = transport
+        self.path = path
+        self.arbitrate = arbitrate
+        self.arbitration_timeout = arbitration_timeout
+        self._arbiter: Optional[DeviceArbiter] = None
+        self.metrics: Optional[HeadsetMetrics] = (
+            metrics if isinstance(metrics, HeadsetMetrics) else HeadsetMetrics() if metrics else None
+        )
+        self.trace: Optional[PacketTrace] = (
+            trace if isinstance(trace, PacketTrace) else PacketTrace() if trace else None
+        )
+        self.battery_history = battery_history
 
     def connect(self) -> None:
-        try:
-            self.device = hid.device()
-            self.device.open(protocol.VENDOR_ID, protocol.PRODUCT_ID)
-            self.device.set_nonblocking(0)
-        except Exception as e:
-            raise DeviceNotFoundError(
-                f"Could not open H9 II Headset ({hex(protocol.VENDOR_ID)}:{hex(protocol.PRODUCT_ID)}). "
-                f"Check USB connection and permissions (udev rules)."
-            ) from e
+        self.device = _open_device(self.transport, self.path)
+        if self.trace is not None:
+            self.device = TracingTransport(self.device, self.trace)
+        self.device.set_nonblocking(0)
+        device_path = getattr(self.device, "device_path", None)
+        if self.arbitrate and device_path and DeviceArbiter.supported:
+            self._arbiter = DeviceArbiter(device_path, self.arbitration_timeout)
+            self._arbiter.open()
+        if self.use_reactor:
+            self._reactor = HidReactor(self.device, metrics=self.metrics)
+            if self.cache is not None:
+                self._cache_events = self._reactor.subscribe(event_cmds(EVENT_FIELDS))
+            self._reactor.start()
 
     def close(self) -> None:
+        if self._reactor:
+            self._reactor.stop()
+            self._reactor = None
+        if self.cache is not None:
+            self.cache.clear()
+            self._cache_events = None
+        if self._arbiter:
+            self._arbiter.close()
+            self._arbiter = None
         if self.device:
             self.device.close()
             self.device = None
 
+    def _turn(self, seqs: int = 0) -> ContextManager[Optional[int]]:
+        """This process's turn on the device, yielding the first shared sequence number (None if not arbitrated)."""
+        return self._arbiter.turn(seqs) if self._arbiter else nullcontext()
+
     def __enter__(self) -> "ZoneHeadset":
         self.connect()
         return self
@@ -39,112 +219,201 @@ class ZoneHeadset:
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
         self.close()
 
-    def _send_cmd(self, setting_key: str, value: Union[int, Tuple[int, ...]]) -> None:
-        if setting_key not in protocol.WRITE_MAP:
-            raise ProtocolError(f"Unknown setting key: {setting_key}")
+    def _send_cmd(self, setting_key: str, value: Union[int, Tuple[int, ...]],
+                  wait: Optional[bool] = None) -> None:
+        """Writes one setting; unless fire-and-forget, returns once the device acknowledges it."""
+        self._write_settings([(setting_key, value)], wait)
 
-        type_byte, cmd_byte, val_idx, chk_idx, chk_const, spacers = protocol.WRITE_MAP[setting_key]
-
-        data = bytearray(64)
-        header = bytes([
-            protocol.REPORT_ID, type_byte, 0x01, 0x00, 0xfc, (type_byte - 4),
-            protocol.MAGIC_1, protocol.MAGIC_2, 0x41, cmd_byte, 0x02, self.seq
-        ])
-        data[0:len(header)] = header
-        if isinstance(val_idx, tuple):
-            if not isinstance(value, (tuple, list)) or len(value) != len(val_idx):
-                raise ProtocolError(f"Value mismatch for multi-write key {setting_key}")
-            
-            chk_sum_base = 0
-            for i, idx in enumerate(val_idx):
-                v = value[i]
-                data[idx] = v
-                chk_sum_base += v
-            
-            for idx, byte_val in spacers.items():
-                data[idx] = byte_val
-
-            data[chk_idx] = (self.seq + chk_sum_base + chk_const) & 0xFF
-        else:
-            data[val_idx] = value
-
-            for idx, byte_val in spacers.items():
-                data[idx] = byte_val
-
-            data[chk_idx] = (self.seq + value + chk_const) & 0xFF
+    def apply(self, settings: Mapping[str, Union[int, Tuple[int, ...]]], wait: Optional[bool] = None) -> None:
+        """Applies several WRITE_MAP settings as one batch.
 
-        if self.device:
-            self.device.write(data)
+        Every value is validated and clamped before anything is written; the packets then
+        get consecutive sequence numbers, are streamed back-to-back and their
+        acknowledgements are collected together.
+        """
+        self._write_settings([(key, _clamp(key, value)) for key, value in settings.items()], wait)
 
-        self.seq = (self.seq + 1) if self.seq < 255 else 1
+    def _write_settings(self, items: Sequence[Tuple[str, Union[int, Tuple[int, ...]]]],
+                        wait: Optional[bool]) -> None:
+        wait = self.wait_for_ack if wait is None else wait
+        if not self.device:
+            raise DeviceNotFoundError("Device not connected")
 
-        try:
-            if self.device:
-                self.device.read(64, timeout_ms=20)
-        except:
-            pass
+        with self._turn(len(items)) as shared_seq:
+            with self._lock:
+                if shared_seq is not None:
+                    self.seq = shared_seq
+                packets, self.seq = _encode_settings(items, self.seq, self._write_buffers)
+                acks = {protocol.ack_key(data): setting_key for setting_key, data in packets}
+                metrics = self.metrics
+                if metrics is not None:
+                    metrics.count('writes', len(packets))
+
+                if not self._reactor:
+                    start = time.monotonic()
+                    for _, data in packets:
+                        self.device.write(data)
+                    if wait:
+                        self._await_acks(acks, start)
+                    return
+
+                futures = {key: self._reactor.expect(key)[0] for key in acks} if wait else {}
+                start = time.monotonic()
+                for _, data in packets:
+                    self._reactor.write(data)
+                if self.cache is not None:
+                    self.cache.invalidate(WRITE_REPORTS[key] for key, _ in items if key in WRITE_REPORTS)
+
+            deadline = start + self.ack_timeout
+            for key, fut in futures.items():
+                try:
+                    fut.result(timeout=max(0.0, deadline - time.monotonic()))
+                except FutureTimeoutError:
+                    for pending_key, pending in futures.items():
+                        self._reactor.discard(pending_key, pending)
+                    if metrics is not None:
+                        metrics.count('protocol_errors')
+                    raise ProtocolError(f"No acknowledgement for {acks[key]} (seq {key[1]})") from None
+                if metrics is not None:
+                    metrics.observe_write(acks[key], time.monotonic() - start)
+
+    def _await_acks(self, acks: Dict[Tuple[int, int], str], start: float) -> None:
+        pending = dict(acks)
+        metrics = self.metrics
+        deadline = start + self.ack_timeout
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                key = next(iter(pending))
+                if metrics is not None:
+                    metrics.count('protocol_errors')
+                raise ProtocolError(f"No acknowledgement for {pending[key]} (seq {key[1]})")
+            data = self.device.read(64, timeout_ms=max(1, int(remaining * 1000)))
+            if not data:
+                continue
+            if protocol.is_event(data):
+                self._backlog.append(data)
+            elif len(data) >= 64:
+                setting_key = pending.pop(protocol.ack_key(data), None)
+                if metrics is not None:
+                    if setting_key is None:
+                        metrics.count('discarded_packets')
+                    else:
+                        metrics.observe_write(setting_key, time.monotonic() - start)
 
     def _get_report(self, cmd_id: int, retries: int = 10) -> List[int]:
-        req = bytearray(64)
-
-        read_checksum = (cmd_id + 0x9C) & 0xFF
-
-        header = bytes([
-            protocol.REPORT_ID, 0x0C, 0x01, 0x00, 0xFC, 0x08,
-            protocol.MAGIC_1, protocol.MAGIC_2, 0x41, cmd_id,
-            0x01, 0x01, 0x00, read_checksum  
-        ])
-        req[0:len(header)] = header
+        return self._get_reports((cmd_id,), retries)[cmd_id]
 
+    def _get_reports(self, cmd_ids: Sequence[int], retries: int = 10) -> Dict[int, List[int]]:
+        """Pipelined read: sends every request back-to-back, then sorts responses by CMD byte."""
         if not self.device:
             raise DeviceNotFoundError("Device not connected")
 
+        if self._reactor:
+            with self._turn():
+                return self._get_reports_via_reactor(cmd_ids, timeout=retries * 0.015)
+        with self._turn():
+            return self._exchange_reports(cmd_ids, retries)
+
+    def _exchange_reports(self, cmd_ids: Sequence[int], retries: int) -> Dict[int, List[int]]:
+        metrics = self.metrics
         while True:
             d = self.device.read(64, timeout_ms=10)
             if not d: break
-
-        self.device.write(req)
-
-        for _ in range(retries):
+            if protocol.is_event(d):
+                self._backlog.append(d)
+            elif metrics is not None:
+                metrics.count('discarded_packets')
+
+        requested = list(dict.fromkeys(cmd_ids))
+        pending = set(requested)
+        start = time.monotonic()
+        for cmd_id in requested:
+            self.device.write(protocol.read_request(cmd_id))
+
+        results: Dict[int, List[int]] = {}
+        misses = 0
+        while pending and misses < retries:
             data = self.device.read(64, timeout_ms=15)
-            if not data: continue
-
-            if len(data) >= 64 and data[9] == cmd_id:
-                return data
-
-        raise ProtocolError(f"Timeout waiting for Report CMD {hex(cmd_id)}")
+            if data and protocol.is_event(data):
+                self._backlog.append(data)
+                misses += 1
+            elif data and len(data) >= 64 and data[9] in pending:
+                results[data[9]] = data
+                pending.discard(data[9])
+                misses = 0
+                if metrics is not None:
+                    metrics.observe_report(data[9], time.monotonic() - start)
+                continue
+            else:
+                misses += 1
+                if data and metrics is not None:
+                    metrics.count('discarded_packets')
+            if metrics is not None:
+                metrics.count('report_retries')
+
+        if pending:
+            if metrics is not None:
+                metrics.count('protocol_errors')
+            missing = ", ".join(hex(c) for c in sorted(pending))
+            raise ProtocolError(f"Timeout waiting for Report CMD {missing}")
+        return results
+
+    def _get_reports_via_reactor(self, cmd_ids: Sequence[int], timeout: float) -> Dict[int, List[int]]:
+        reactor = self._reactor
+        metrics = self.metrics
+        futures = {}
+        start = time.monotonic()
+        for cmd_id in dict.fromkeys(cmd_ids):
+            fut, is_new = reactor.expect(cmd_id)
+            futures[cmd_id] = fut
+            if is_new:
+                reactor.write(protocol.read_request(cmd_id))
+
+        deadline = start + timeout
+        results: Dict[int, List[int]] = {}
+        for cmd_id, fut in futures.items():
+            try:
+                results[cmd_id] = fut.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FutureTimeoutError:
+                for pending_id, pending in futures.items():
+                    reactor.discard(pending_id, pending)
+                if metrics is not None:
+                    metrics.count('protocol_errors')
+                raise ProtocolError(f"Timeout waiting for Report CMD {hex(cmd_id)}") from None
+            if metrics is not None:
+                metrics.observe_report(cmd_id, time.monotonic() - start)
+        return results
 
     def set_volume(self, value: int) -> None:
-        self._send_cmd('volume', max(0, min(30, int(value))))
+        self._send_cmd('volume', _clamp('volume', value))
 
     def set_balance(self, value: int) -> None:
-        self._send_cmd('balance', max(0, min(100, int(value))))
+        self._send_cmd('balance', _clamp('balance', value))
 
     def set_sidetone(self, value: int) -> None:
-        self._send_cmd('sidetone', max(0, min(10, int(value))))
+        self._send_cmd('sidetone', _clamp('sidetone', value))
 
     def set_noise_cancelling(self, mode: int) -> None:
-        self._send_cmd('nc_mode', max(0, min(2, int(mode))))
+        self._send_cmd('nc_mode', _clamp('nc_mode', mode))
 
     def set_auto_power_off(self, minutes: int) -> None:
-        self._send_cmd('auto_off', int(minutes))
+        self._send_cmd('auto_off', _clamp('auto_off', minutes))
 
     def set_notification_voice(self, enabled: bool) -> None:
         self._send_cmd('notif_voice', 1 if enabled else 0)
 
     def set_voice_language(self, lang_idx: int) -> None:
-        self._send_cmd('voice_lang', max(0, min(2, int(lang_idx))))
+        self._send_cmd('voice_lang', _clamp('voice_lang', lang_idx))
 
     def set_boot_nc_mode(self, mode: int) -> None:
-        self._send_cmd('boot_nc', max(0, min(3, int(mode))))
+        self._send_cmd('boot_nc', _clamp('boot_nc', mode))
 
     def set_boot_bt_mode(self, mode: int) -> None:
-        self._send_cmd('boot_bt', max(0, min(2, int(mode))))
+        self._send_cmd('boot_bt', _clamp('boot_bt', mode))
 
     def set_ambient_sound(self, level: int, focus: bool) -> None:
-        level = max(0, min(20, int(level)))
-        focus_val = 1 if focus else 0
-        self._send_cmd('ambient_sound', (level, focus_val))
+        self._send_cmd('ambient_sound', _clamp('ambient_sound', (level, 1 if focus else 0)))
 
     def set_ambient_sound_level(self, level: int) -> None:
         """Helper for CLI: sets level with Focus=False"""
@@ -154,80 +423,188 @@ class ZoneHeadset:
         """Helper for CLI: sets focus with Level=20 (Max)"""
         self.set_ambient_sound(20, bool(focus))
 
-    def get_audio_status(self) -> AudioStatus:
-        data = self._get_report(protocol.REQ_AUDIO_STATUS)
-        
-        return AudioStatus(
-            volume=data[17],
-            balance=data[19],
-            sidetone=data[20],
-            battery_level=data[15],
-            charging=bool(data[14])
+    def get_device_info(self, fresh: bool = False) -> DeviceInfo:
+        return self.get_reports(protocol.REQ_DEVICE_INFO, fresh=fresh)[protocol.REQ_DEVICE_INFO]
+
+    def get_power_status(self, fresh: bool = False) -> PowerState:
+        return self.get_reports(protocol.REQ_POWER_STATUS, fresh=fresh)[protocol.REQ_POWER_STATUS]
+
+    def get_audio_status(self, fresh: bool = False) -> AudioStatus:
+        return self.get_reports(protocol.REQ_AUDIO_STATUS, fresh=fresh)[protocol.REQ_AUDIO_STATUS]
+
+    def get_nc_status(self, fresh: bool = False) -> NcStatus:
+        return self.get_reports(protocol.REQ_NC_STATUS, fresh=fresh)[protocol.REQ_NC_STATUS]
+
+    def get_system_status(self, fresh: bool = False) -> SystemStatus:
+        return self.get_reports(protocol.REQ_SYSTEM_STATUS, fresh=fresh)[protocol.REQ_SYSTEM_STATUS]
+
+    def get_reports(self, *cmd_ids: int, fresh: bool = False) -> Dict[int, Any]:
+        """Reads several status reports in one pipelined exchange, keyed by REQ_* id."""
+        return {cmd_id: report.value for cmd_id, report in self.read_reports(*cmd_ids, fresh=fresh).items()}
+
+    def read_reports(self, *cmd_ids: int, fresh: bool = False) -> Dict[int, CachedReport]:
+        """Like get_reports(), but each report is tagged with its age in seconds.
+
+        Without a cache, or with `fresh=True`, every report comes from the wire (age 0).
+        Otherwise only missing or expired reports are read, in one pipelined exchange.
+        """
+        reports: Dict[int, CachedReport] = {}
+        if self.cache is not None and not fresh:
+            self._sync_cache()
+            now = time.monotonic()
+            for cmd_id in cmd_ids:
+                cached = self.cache.lookup(cmd_id, now)
+                if cached is not None:
+                    reports[cmd_id] = cached
+            if len(reports) == len(cmd_ids):
+                return reports
+
+        missing = [cmd_id for cmd_id in dict.fromkeys(cmd_ids) if cmd_id not in reports]
+        if missing:
+            raw = self._get_reports(missing)
+            decoded = {cmd_id: decode_report(cmd_id, raw[cmd_id]) for cmd_id in missing}
+            if self.cache is not None:
+                self.cache.update(decoded)
+            for cmd_id, value in decoded.items():
+                reports[cmd_id] = CachedReport(value, 0.0)
+                if self.battery_history is not None and isinstance(value, (PowerState, AudioStatus)):
+                    self.battery_history.append(value.battery_level, value.charging)
+        return {cmd_id: reports[cmd_id] for cmd_id in cmd_ids}
+
+    def _sync_cache(self) -> None:
+        """Applies the events the reactor queued since the last read."""
+        events = self._cache_events
+        if events is None:
+            return
+        # Serialized so that concurrent readers apply the events in queue order.
+        with self._cache_lock:
+            while True:
+                try:
+                    data = events.get_nowait()
+                except queue.Empty:
+                    return
+                if data is DISCONNECTED:
+                    return
+                event = decode_event(data)
+                if event is not None:
+                    self.cache.apply_event(event)
+
+    def battery_estimate(self) -> Optional[BatteryEstimate]:
+        """Time to empty (or to full) from `battery_history`; None without one or without a trend."""
+        return self.battery_history.estimate() if self.battery_history is not None else None
+
+    def get_all_data(self, fresh: bool = False) -> HeadsetFullStatus:
+        reports = self.get_reports(
+            protocol.REQ_AUDIO_STATUS, protocol.REQ_NC_STATUS, protocol.REQ_SYSTEM_STATUS, fresh=fresh
         )
-
-    def get_nc_status(self) -> NcStatus:
-        data = self._get_report(protocol.REQ_NC_STATUS)
-        return NcStatus(
-            nc_mode=NcMode(data[16]),
-            mic_muted=bool(data[13]),
-            ambient_level=data[17],
-            focus_on_voice=bool(data[19])
-        )
-
-    def get_system_status(self) -> SystemStatus:
-        data = self._get_report(protocol.REQ_SYSTEM_STATUS)
-        return SystemStatus(
-            boot_nc=BootNcMode(data[13]),
-            bt_state=BluetoothState(enabled=bool(data[14]), connected=data[15] == 1),
-            boot_bt=BootBtMode(data[17]),
-            auto_off_minutes=data[18],
-            language=Language(data[21]),
-            notif_enabled=data[22] == 1,
-            mic_connected=data[24] == 0
-        )
-
-    def get_all_data(self) -> HeadsetFullStatus:
         return HeadsetFullStatus(
-            audio=self.get_audio_status(),
-            nc=self.get_nc_status(),
-            system=self.get_system_status()
+            audio=reports[protocol.REQ_AUDIO_STATUS],
+            nc=reports[protocol.REQ_NC_STATUS],
+            system=reports[protocol.REQ_SYSTEM_STATUS]
         )
 
-    def listen(self) -> Generator[HeadsetEvent, None, None]:
-        """Yields typed HeadsetEvent objects."""
+    def resync(self, previous: Optional[HeadsetFullStatus] = None
+               ) -> Generator[Tuple[str, Any, Dict[str, Any]], None, None]:
+        """Re-reads the status after a reconnect, yielding (attribute, report, changed fields)
+        for each report of HeadsetFullStatus, in RESYNC_PHASES order.
+
+        Only fields that differ from `previous` are listed (all of them without it). In
+        reactor mode, fields that an event updated while a read was in flight are left
+        out, since the event listen() delivers is at least as new as the report.
+        """
+        events = self._reactor.subscribe(event_cmds(EVENT_FIELDS)) if self._reactor else None
+        try:
+            for phase in RESYNC_PHASES:
+                reports = self.get_reports(*(cmd_id for _, cmd_id in phase), fresh=True)
+                touched = set()
+                while events is not None and not events.empty():
+                    data = events.get_nowait()
+                    event = decode_event(data) if data is not DISCONNECTED else None
+                    if event is not None:
+                        touched.update((cmd_id, field) for cmd_id, field, _ in EVENT_FIELDS[event.type])
+                for name, cmd_id in phase:
+                    changes = changed_fields(previous and getattr(previous, name), reports[cmd_id])
+                    yield name, reports[cmd_id], {
+                        field: value for field, value in changes.items() if (cmd_id, field) not in touched
+                    }
+        finally:
+            if events is not None:
+                self._reactor.unsubscribe(events)
+
+    def listen(self, types: Optional[Iterable[EventType]] = None,
+               stop: Optional[StopToken] = None) -> Generator[HeadsetEvent, None, None]:
+        """Yields typed HeadsetEvent objects, optionally only those of the given `types`.
+
+        The filter is applied to the raw CMD byte, so skipped events are never decoded.
+        The generator returns once `stop` is set: in reactor mode, or with a transport
+        that supports wakeup() (hidraw), the pending read is interrupted at once; plain
+        hidapi reads are re-checked every 50 ms. Losing the device raises DeviceNotFoundError.
+        """
         if not self.device:
             raise DeviceNotFoundError("Device not connected")
 
-        while True:
-            data = self.device.read(64, timeout_ms=1000)
-            if not data: continue
-
-            if len(data) >= 16 and data[2] == 0x04 and data[8] == protocol.EVT_CATEGORY:
-                cmd = data[9]
-
-                if cmd == protocol.EVT_POWER:
-                    yield HeadsetEvent(
-                        EventType.POWER,
-                        PowerState(charging=bool(data[13]), battery_level=data[14])
-                    )
-
-                elif cmd == protocol.EVT_VOL_CHANGED:
-                    yield HeadsetEvent(EventType.VOLUME, int(data[14]))
-
-                elif cmd == protocol.EVT_BAL_CHANGED:
-                    yield HeadsetEvent(EventType.BALANCE, int(data[13]))
+        wanted = event_cmds(types)
+        if self._reactor:
+            yield from self._listen_via_reactor(wanted, stop)
+            return
 
-                elif cmd == protocol.EVT_NC_CHANGED:
-                    yield HeadsetEvent(EventType.NC_MODE, NcMode(data[13]))
-
-                elif cmd == protocol.EVT_MIC_MUTE:
-                    yield HeadsetEvent(EventType.MIC_MUTE, bool(data[13]))
-
-                elif cmd == protocol.EVT_MIC_CONN:
-                    yield HeadsetEvent(EventType.MIC_CONN, data[13] == 0)
-
-                elif cmd == protocol.EVT_BT_STATE:
-                    yield HeadsetEvent(
-                        EventType.BLUETOOTH,
-                        BluetoothState(enabled=bool(data[13]), connected=bool(data[14]))
-                    )
+        wakeup = getattr(self.device, "wakeup", None)
+        timeout_ms = 1000 if stop is None or wakeup is not None else 50
+        if stop is not None and wakeup is not None:
+            stop.add_callback(wakeup)
+        try:
+            while stop is None or not stop.is_set():
+                if self._backlog:
+                    data = self._backlog.popleft()
+                else:
+                    try:
+                        data = self.device.read(64, timeout_ms=timeout_ms)
+                    except OSError as e:
+                        raise DeviceNotFoundError("Device disconnected") from e
+                if not data: continue
+
+                if wanted is not None and (len(data) < 16 or data[9] not in wanted):
+                    continue
+                event = decode_event(data)
+                if event is not None:
+                    if self.metrics is not None:
+                        self.metrics.count_event(event.type.value)
+                    if self.battery_history is not None and event.type is EventType.POWER:
+                        self.battery_history.append(event.value.battery_level, event.value.charging)
+                    yield event
+        finally:
+            if stop is not None and wakeup is not None:
+                stop.remove_callback(wakeup)
+                clear_wakeup = getattr(self.device, "clear_wakeup", None)
+                if clear_wakeup is not None:
+                    clear_wakeup()
+
+    def _listen_via_reactor(self, wanted: Optional[FrozenSet[int]],
+                            stop: Optional[StopToken]) -> Generator[HeadsetEvent, None, None]:
+        reactor = self._reactor
+        events = reactor.subscribe(wanted)
+        wake = partial(events.put, None)
+        if stop is not None:
+            stop.add_callback(wake)
+        try:
+            while stop is None or not stop.is_set():
+                try:
+                    data = events.get(timeout=1.0)
+                except queue.Empty:
+                    continue
+                if data is None:
+                    continue
+                if data is DISCONNECTED:
+                    raise DeviceNotFoundError("Device disconnected") from reactor.error
+
+                event = decode_event(data)
+                if event is not None:
+                    if self.metrics is not None:
+                        self.metrics.count_event(event.type.value)
+                    if self.battery_history is not None and event.type is EventType.POWER:
+                        self.battery_history.append(event.value.battery_level, event.value.charging)
+                    yield event
+        finally:
+            if stop is not None:
+                stop.remove_callback(wake)
+            reactor.unsubscribe(events)
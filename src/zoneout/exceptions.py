@@ -1,3 +1,6 @@
+from typing import Any, Dict
+
+
 class ZoneError(Exception):
     """Base exception for ZoneOut driver."""
     pass
@@ -11,3 +14,22 @@ class DeviceNotFoundError(ZoneError):
 class ProtocolError(ZoneError):
     """Raised when the device sends an unexpected response or timeouts."""
     pass
+
+
+class GroupError(ZoneError):
+    """Raised when an operation fails on some headsets of a HeadsetGroup.
+
+    `results` holds the values from the headsets that succeeded and `errors` the
+    exception raised for each one that failed, both keyed by serial number.
+    """
+
+    def __init__(self, results: Dict[str, Any], errors: Dict[str, Exception]) -> None:
+        details = "; ".join(f"{key}: {error}" for key, error in errors.items())
+        super().__init__(f"Failed on {len(errors)} of {len(results) + len(errors)} headsets ({details})")
+        self.results = results
+        self.errors = errors
+
+
+class DeviceBusyError(ZoneError):
+    """Raised when another process keeps the device longer than the arbitration timeout."""
+    pass
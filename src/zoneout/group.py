@@ -0,0 +1,133 @@
+from concurrent.futures import ThreadPoolExecutor
+from operator import methodcaller
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, TypeVar, Union
+
+from .cache import CachedReport
+from .device import ZoneHeadset
+from .exceptions import DeviceNotFoundError, GroupError, ZoneError
+from .models import DeviceInfo, HeadsetFullStatus, HeadsetInfo
+from .transport import enumerate_paths
+
+
+T = TypeVar("T")
+
+
+def _open_path(path: str, transport: Optional[str],
+               options: Mapping[str, Any]) -> Optional[Tuple[DeviceInfo, ZoneHeadset]]:
+    headset = ZoneHeadset(transport=transport, path=path, **options)
+    try:
+        headset.connect()
+        return headset.get_device_info(), headset
+    except ZoneError:
+        headset.close()
+        return None
+
+
+class HeadsetGroup:
+    """Several headsets driven together, keyed by serial number.
+
+    Every call runs on all headsets at once through a worker pool, so it takes about as
+    long as the slowest device rather than the sum of them. If some headsets fail, the
+    call raises GroupError carrying both the results and the errors.
+    """
+
+    def __init__(self, headsets: Mapping[str, ZoneHeadset], max_workers: Optional[int] = None) -> None:
+        self.headsets: Dict[str, ZoneHeadset] = dict(headsets)
+        self.max_workers = max_workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    @classmethod
+    def discover(cls, transport: Optional[str] = None, max_workers: Optional[int] = None,
+                 **headset_options: Any) -> "HeadsetGroup":
+        """Connects to every transceiver enumerate_paths() finds, probing them in parallel.
+
+        Paths that cannot be opened or do not answer the Device Info request (such as
+        other HID interfaces of a transceiver) are skipped. `headset_options` are passed
+        to each ZoneHeadset.
+        """
+        paths = enumerate_paths(transport)
+        headsets: Dict[str, ZoneHeadset] = {}
+        if paths:
+            with ThreadPoolExecutor(max_workers=max_workers or len(paths)) as pool:
+                probed = pool.map(lambda path: _open_path(path, transport, headset_options), paths)
+                for found in probed:
+                    if found is None:
+                        continue
+                    info, headset = found
+                    if info.serial in headsets:
+                        headset.close()
+                    else:
+                        headsets[info.serial] = headset
+        return cls(headsets, max_workers)
+
+    def connect(self) -> None:
+        self.map(lambda headset: headset.connect() if headset.device is None else None)
+
+    def close(self) -> None:
+        for headset in self.headsets.values():
+            headset.close()
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self) -> "HeadsetGroup":
+        try:
+            self.connect()
+        except GroupError:
+            self.close()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.headsets)
+
+    def map(self, fn: Callable[[ZoneHeadset], T]) -> Dict[str, T]:
+        """Calls `fn` on every headset in parallel and returns the results by serial number."""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers or max(1, len(self.headsets)),
+                                            thread_name_prefix="zoneout-group")
+        futures = {serial: self._pool.submit(fn, headset) for serial, headset in self.headsets.items()}
+        results: Dict[str, T] = {}
+        errors: Dict[str, Exception] = {}
+        for serial, future in futures.items():
+            try:
+                results[serial] = future.result()
+            except Exception as e:
+                errors[serial] = e
+        if errors:
+            raise GroupError(results, errors)
+        return results
+
+    def get_all_data(self, fresh: bool = False) -> Dict[str, HeadsetFullStatus]:
+        return self.map(methodcaller("get_all_data", fresh=fresh))
+
+    def get_reports(self, *cmd_ids: int, fresh: bool = False) -> Dict[str, Dict[int, Any]]:
+        return self.map(methodcaller("get_reports", *cmd_ids, fresh=fresh))
+
+    def read_reports(self, *cmd_ids: int, fresh: bool = False) -> Dict[str, Dict[int, CachedReport]]:
+        return self.map(methodcaller("read_reports", *cmd_ids, fresh=fresh))
+
+    def apply(self, settings: Mapping[str, Union[int, Tuple[int, ...]]],
+              wait: Optional[bool] = None) -> Dict[str, None]:
+        """Applies the same settings batch to every headset."""
+        return self.map(methodcaller("apply", settings, wait))
+
+
+def enumerate_headsets(transport: Optional[str] = None) -> List[HeadsetInfo]:
+    """Lists the connected transceivers with their headsets' serial numbers."""
+    with HeadsetGroup.discover(transport) as group:
+        return [HeadsetInfo(headset.path, serial) for serial, headset in group.headsets.items()]
+
+
+def find_headset(device: str, transport: Optional[str] = None) -> str:
+    """Resolves a transport path or serial number to a transport path."""
+    paths = enumerate_paths(transport)
+    if device in paths:
+        return device
+    for info in enumerate_headsets(transport):
+        if info.serial == device:
+            return info.path
+    raise DeviceNotFoundError(f"No H9 II Headset with path or serial '{device}' ({len(paths)} device paths checked)")
@@ -1,14 +1,18 @@
-import time
 from typing import Optional
 
 from PyQt6.QtCore import QObject, pyqtSignal, pyqtProperty, QThread, pyqtSlot, QTimer, QSettings
 
-from zoneout.device import ZoneHeadset
+from zoneout.battery import open_history
+from zoneout.device import ZoneHeadset, StopToken, RESYNC_PHASES
 from zoneout.models import (
     NcMode, BootNcMode, BootBtMode, Language, HeadsetEvent, EventType,
-    PowerState, BluetoothState
+    PowerState, BluetoothState, AudioStatus, NcStatus, SystemStatus, HeadsetFullStatus
 )
-from zoneout.exceptions import DeviceNotFoundError
+from zoneout.exceptions import DeviceNotFoundError, ZoneError
+from zoneout.hotplug import HotplugWatcher
+
+
+HEADSET_REPORTS = [name for phase in RESYNC_PHASES for name, _ in phase]
 
 
 class MonitorThread(QThread):
@@ -18,29 +22,38 @@ class MonitorThread(QThread):
     def __init__(self, headset: ZoneHeadset):
         super().__init__()
         self.headset = headset
-        self._running = True
+        self._stop = StopToken()
 
     def run(self):
-        while self._running:
-            try:
-                for event in self.headset.listen():
-                    if not self._running:
-                        break
-                    self.event_received.emit(event)
-            except DeviceNotFoundError:
+        try:
+            for event in self.headset.listen(stop=self._stop):
+                self.event_received.emit(event)
+        except DeviceNotFoundError:
+            if not self._stop.is_set():
                 self.connection_lost.emit("Device disconnected")
-                break
-            except Exception as e:
+        except Exception as e:
+            if not self._stop.is_set():
                 self.connection_lost.emit(str(e))
-                break
-            
-            time.sleep(1)
 
     def stop(self):
-        self._running = False
-        self.quit()
+        self._stop.set()
         self.wait()
 
+class ResyncThread(QThread):
+    report_ready = pyqtSignal(str, object, object)
+
+    def __init__(self, headset: ZoneHeadset, previous: Optional[HeadsetFullStatus]):
+        super().__init__()
+        self.headset = headset
+        self.previous = previous
+
+    def run(self):
+        try:
+            for name, report, changes in self.headset.resync(self.previous):
+                self.report_ready.emit(name, report, changes)
+        except ZoneError:
+            pass  # a lost device is reported by the monitor thread
+
 class HeadsetController(QObject):
     volumeChanged = pyqtSignal(int)
     balanceChanged = pyqtSignal(int)
@@ -56,6 +69,7 @@ class HeadsetController(QObject):
     
     batteryLevelChanged = pyqtSignal(int)
     isChargingChanged = pyqtSignal(bool)
+    batteryEtaChanged = pyqtSignal(str)
     micMutedChanged = pyqtSignal(bool)
     micConnectedChanged = pyqtSignal(bool)
     bluetoothConnectedChanged = pyqtSignal(bool)
@@ -65,15 +79,32 @@ class HeadsetController(QObject):
     
     connectionStatusChanged = pyqtSignal(bool, str)
     usbConnectedChanged = pyqtSignal(bool)
+    _deviceAdded = pyqtSignal(str)
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, transport=None, hotplug=True, battery_history=True):
+        """`transport` is passed to ZoneHeadset (e.g. a SimulatedHeadset); `hotplug` and
+        `battery_history` can be turned off to run without touching the system."""
         super().__init__(parent)
+        self._transport = transport
         self._headset: Optional[ZoneHeadset] = None
         self._monitor_thread: Optional[MonitorThread] = None
+        self._resync_thread: Optional[ResyncThread] = None
+        self._resync_reports = {}
+        self._status: Optional[HeadsetFullStatus] = None
         
         self._retry_timer = QTimer(self)
         self._retry_timer.setInterval(5000) 
         self._retry_timer.timeout.connect(self.connect_device)
+
+        # Reconnect as soon as the transceiver enumerates; the retry timer is used where
+        # hotplug uevents are unavailable and when reconnecting after an error fails.
+        self._deviceAdded.connect(self._on_device_added)
+        self._hotplug: Optional[HotplugWatcher] = HotplugWatcher(on_connect=self._deviceAdded.emit) if hotplug else None
+        try:
+            if self._hotplug is not None:
+                self._hotplug.start()
+        except OSError:
+            self._hotplug = None
         
         self._volume = 0
         self._balance = 50
@@ -89,12 +120,37 @@ class HeadsetController(QObject):
         
         self._battery_level = -1
         self._is_charging = False
+        self._battery_eta = ""
+        self._battery_history = open_history() if battery_history else None
+
+        # The estimate moves with time even while the level holds.
+        self._eta_timer = QTimer(self)
+        self._eta_timer.setInterval(60000)
+        self._eta_timer.timeout.connect(self._update_battery_eta)
+        self._eta_timer.start()
         self._mic_muted = False
         self._mic_connected = True
         self._bt_connected = False
         self._bt_enabled = False
 
         self._usb_connected = False
+
+        self._report_updaters = {
+            'volume': self._update_volume,
+            'balance': self._update_balance,
+            'sidetone': self._update_sidetone,
+            'nc_mode': self._update_nc_mode,
+            'mic_muted': self._update_mic_mute,
+            'ambient_level': self._update_ambient_level,
+            'focus_on_voice': self._update_focus_on_voice,
+            'auto_off_minutes': self._update_auto_off,
+            'language': self._update_language,
+            'notif_enabled': self._update_notif_sound,
+            'mic_connected': self._update_mic_conn,
+            'bt_state': self._update_bt_state,
+            'boot_nc': self._update_boot_nc,
+            'boot_bt': self._update_boot_bt,
+        }
         
         self._settings = QSettings("ZoneOut", "HeadsetSettings")
         
@@ -113,8 +169,10 @@ class HeadsetController(QObject):
 
     def connect_device(self):
         try:
-            self._headset = ZoneHeadset()
-            self._headset.connect()
+            headset = ZoneHeadset(reactor=True, wait_for_ack=False, transport=self._transport,
+                                  battery_history=self._battery_history)
+            headset.connect()
+            self._headset = headset
             
             if self._retry_timer.isActive():
                 self._retry_timer.stop()
@@ -122,58 +180,90 @@ class HeadsetController(QObject):
             self._usb_connected = True
             self.usbConnectedChanged.emit(True)
             self.connectionStatusChanged.emit(True, "Connected")
-            self.refresh_all()
             self.start_monitor()
+            self.start_resync()
         except Exception as e:
             self._usb_connected = False
             self.usbConnectedChanged.emit(False)
             self.connectionStatusChanged.emit(False, str(e))
             
-            if not self._retry_timer.isActive():
+            if self._hotplug is None and not self._retry_timer.isActive():
                 self._retry_timer.start()
 
-    def refresh_all(self):
-        if not self._headset:
+    def _on_device_added(self, node):
+        if self._headset is None:
+            self.connect_device()
+
+    def _displayed_status(self) -> Optional[HeadsetFullStatus]:
+        """The status the UI shows, including what events and setters changed since the last
+        full resync; None before the first one, so that everything gets applied."""
+        if self._status is None:
+            return None
+        return HeadsetFullStatus(
+            audio=AudioStatus(self._volume, self._balance, self._sidetone, self._battery_level, self._is_charging),
+            nc=NcStatus(self._nc_mode, self._mic_muted, self._ambient_level, self._focus_on_voice),
+            system=SystemStatus(self._boot_nc, self._boot_bt, BluetoothState(self._bt_enabled, self._bt_connected),
+                                self._auto_off, self._language, self._notif_sound, self._mic_connected),
+        )
+
+    def start_resync(self):
+        """Re-reads the status in the background, applying only what differs from what the
+        UI shows; audio and NC arrive after one round-trip, the system report after that."""
+        self.stop_resync()
+
+        if self._headset:
+            self._resync_reports = {}
+            self._resync_thread = ResyncThread(self._headset, self._displayed_status())
+            self._resync_thread.report_ready.connect(self._apply_report)
+            self._resync_thread.start()
+
+    def stop_resync(self):
+        if self._resync_thread:
+            self._resync_thread.wait()
+            self._resync_thread = None
+
+    def _apply_report(self, name, report, changes):
+        if self._resync_thread is None or self._resync_thread.headset is not self._headset:
             return
-            
-        status = self._headset.get_all_data()
-        
-        self._update_volume(status.audio.volume)
-        self._update_balance(status.audio.balance)
-        self._update_sidetone(status.audio.sidetone)
-        self._update_battery(status.audio.battery_level, status.audio.charging)
-        
-        self._update_nc_mode(status.nc.nc_mode)
-        self._update_mic_mute(status.nc.mic_muted)
-        self._update_ambient_level(status.nc.ambient_level)
-        self._update_focus_on_voice(status.nc.focus_on_voice)
-        
-        self._update_auto_off(status.system.auto_off_minutes)
-        self._update_language(status.system.language)
-        self._update_notif_sound(status.system.notif_enabled)
-        self._update_mic_conn(status.system.mic_connected)
-        self._update_bt_state(status.system.bt_state)
-        self._update_boot_nc(status.system.boot_nc)
-        self._update_boot_bt(status.system.boot_bt)
+        self._resync_reports[name] = report
+        if len(self._resync_reports) == len(HEADSET_REPORTS):
+            self._status = HeadsetFullStatus(**self._resync_reports)
+
+        for field, value in changes.items():
+            if field in ('battery_level', 'charging'):
+                self._update_battery(report.battery_level, report.charging)
+            elif field in self._report_updaters:
+                self._report_updaters[field](value)
 
     def start_monitor(self):
-        if self._monitor_thread:
-            self._monitor_thread.stop()
-        
+        self.stop_monitor()
+
         if self._headset:
             self._monitor_thread = MonitorThread(self._headset)
             self._monitor_thread.event_received.connect(self._handle_event)
             self._monitor_thread.connection_lost.connect(self._handle_disconnect)
             self._monitor_thread.start()
 
+    def stop_monitor(self):
+        if self._monitor_thread:
+            self._monitor_thread.stop()
+            self._monitor_thread = None
+
     def _handle_disconnect(self, msg):
         self._usb_connected = False
         self.usbConnectedChanged.emit(False)
         self.connectionStatusChanged.emit(False, msg)
-        self._headset = None
         self._low_battery_notified = False
-        
-        if not self._retry_timer.isActive():
+
+        self.stop_monitor()
+        if self._headset:
+            self._headset.close()
+            self._headset = None
+        self.stop_resync()
+        self._update_battery_eta()
+        self.connect_device()
+        # A read error can leave the device enumerated, so hotplug may never announce it again.
+        if self._headset is None and not self._retry_timer.isActive():
             self._retry_timer.start()
 
     @pyqtSlot()
@@ -254,6 +344,19 @@ class HeadsetController(QObject):
                 status = "Charging started" if charging else "Charging stopped"
                 self.notificationRequested.emit("Power", status)
 
+        self._update_battery_eta()
+
+    def _update_battery_eta(self):
+        estimate = self._headset.battery_estimate() if self._headset else None
+        eta = ""
+        if estimate is not None:
+            hours, minutes = divmod(round(estimate.seconds / 60), 60)
+            duration = f"{hours} h {minutes} min" if hours else f"{minutes} min"
+            eta = f"{duration} to full" if estimate.charging else f"{duration} left"
+        if self._battery_eta != eta:
+            self._battery_eta = eta
+            self.batteryEtaChanged.emit(eta)
+
     def _update_nc_mode(self, val):
         if self._nc_mode != val:
             self._nc_mode = int(val)
@@ -415,6 +518,9 @@ class HeadsetController(QObject):
     
     @pyqtProperty(bool, notify=isChargingChanged)
     def isCharging(self): return self._is_charging
+
+    @pyqtProperty(str, notify=batteryEtaChanged)
+    def batteryEta(self): return self._battery_eta
     
     @pyqtProperty(bool, notify=micMutedChanged)
     def micMuted(self): return self._mic_muted
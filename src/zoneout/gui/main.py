@@ -46,6 +46,8 @@ def main():
     mic_action.setEnabled(False)
     bt_action = tray_menu.addAction("Bluetooth: ...")
     bt_action.setEnabled(False)
+    bat_action = tray_menu.addAction("Battery: ...")
+    bat_action.setEnabled(False)
     
     tray_menu.addSeparator()
     
@@ -103,12 +105,14 @@ def main():
             nc_action.setVisible(False)
             mic_action.setVisible(False)
             bt_action.setVisible(False)
+            bat_action.setVisible(False)
             return
         
         bal_action.setVisible(True)
         nc_action.setVisible(True)
         mic_action.setVisible(True)
         bt_action.setVisible(True)
+        bat_action.setVisible(True)
 
         nc_modes = {0: "Off", 1: "Noise Cancelling", 2: "Ambient Sound"}
         nc_mode_str = nc_modes.get(controller.ncMode, "Unknown")
@@ -133,13 +137,23 @@ def main():
         else:
             bal_str = f"Game {100 - bal}%/{bal}% Chat"
 
+        if controller.batteryLevel < 0:
+            bat_str = "..."
+        else:
+            bat_str = f"{controller.batteryLevel}%"
+            if controller.batteryEta:
+                bat_str += f" ({controller.batteryEta})"
+            elif controller.isCharging:
+                bat_str += " (Charging)"
+
         tooltip = (
             f"ZoneOut\n\n"
             f"Volume: {controller.volume}\n"
             f"Balance: {bal_str}\n"
             f"Noise control mode: {nc_mode_str}\n"
             f"Microphone status: {mic_status}\n"
-            f"Bluetooth status: {bt_status}"
+            f"Bluetooth status: {bt_status}\n"
+            f"Battery: {bat_str}"
         )
         tray_icon.setToolTip(tooltip)
         
@@ -148,6 +162,7 @@ def main():
         nc_action.setText(f"Noise Control: {nc_mode_str}")
         mic_action.setText(f"Mic: {mic_status}")
         bt_action.setText(f"Bluetooth: {bt_status}")
+        bat_action.setText(f"Battery: {bat_str}")
 
     controller.volumeChanged.connect(update_tray_tooltip)
     controller.balanceChanged.connect(update_tray_tooltip)
@@ -157,6 +172,9 @@ def main():
     controller.bluetoothConnectedChanged.connect(update_tray_tooltip)
     controller.bluetoothEnabledChanged.connect(update_tray_tooltip)
     controller.usbConnectedChanged.connect(update_tray_tooltip)
+    controller.batteryLevelChanged.connect(update_tray_tooltip)
+    controller.isChargingChanged.connect(update_tray_tooltip)
+    controller.batteryEtaChanged.connect(update_tray_tooltip)
     
     update_tray_tooltip()
 
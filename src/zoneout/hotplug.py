@@ -0,0 +1,191 @@
+import os
+import select
+import socket
+import struct
+import threading
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from . import protocol
+from .exceptions import DeviceNotFoundError
+from .transport import find_hidraw_nodes
+
+
+T = TypeVar("T")
+
+NETLINK_KOBJECT_UEVENT = 15
+KERNEL_GROUP = 1
+UDEV_GROUP = 2
+UDEV_MAGIC = 0xFEEDCAFE
+UDEV_CONTROL = "/run/udev/control"
+
+
+def parse_uevent(message: bytes) -> Dict[str, str]:
+    """Properties of a kernel uevent ("ACTION@DEVPATH" then KEY=VALUE lines) or a udev
+    broadcast (a "libudev" header followed by KEY=VALUE lines); {} if malformed."""
+    if message.startswith(b"libudev\0"):
+        if len(message) < 24 or struct.unpack_from(">I", message, 8)[0] != UDEV_MAGIC:
+            return {}
+        offset, length = struct.unpack_from("=II", message, 16)
+        lines = message[offset:offset + length].split(b"\0")
+    else:
+        lines = message.split(b"\0")[1:]
+    properties = {}
+    for line in lines:
+        key, sep, value = line.decode("utf-8", "replace").partition("=")
+        if sep:
+            properties[key] = value
+    return properties
+
+
+class HotplugWatcher:
+    """Tracks the transceiver's /dev/hidraw* nodes from kernel uevents (Linux only).
+
+    A background thread sleeps in poll() on a NETLINK_KOBJECT_UEVENT socket, so nothing
+    runs while the device is absent. When udevd is running, its broadcasts are used
+    instead of the kernel's, so a node is only reported once the udev rules have set its
+    permissions. `on_connect`/`on_disconnect` are called from that thread with the node
+    path. start() raises OSError where uevents are unavailable.
+    """
+
+    def __init__(self, on_connect: Optional[Callable[[str], None]] = None,
+                 on_disconnect: Optional[Callable[[str], None]] = None,
+                 vendor_id: int = protocol.VENDOR_ID, product_id: int = protocol.PRODUCT_ID) -> None:
+        self.on_connect = on_connect
+        self.on_disconnect = on_disconnect
+        self.vendor_id = vendor_id
+        self.product_id = product_id
+        self.added = 0
+        # HID device names in a DEVPATH look like 0003:054C:0FA8.0007.
+        self._match = f":{vendor_id:04X}:{product_id:04X}."
+        self._nodes: Dict[str, None] = {}
+        self._cond = threading.Condition()
+        self._sock: Optional[socket.socket] = None
+        self._group = KERNEL_GROUP
+        self._wake_r = self._wake_w = -1
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if getattr(socket, "AF_NETLINK", None) is None:
+            raise OSError("Hotplug uevents need netlink sockets (Linux only)")
+        self._group = UDEV_GROUP if os.path.exists(UDEV_CONTROL) else KERNEL_GROUP
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM | socket.SOCK_CLOEXEC, NETLINK_KOBJECT_UEVENT)
+        try:
+            sock.bind((0, self._group))
+        except OSError:
+            sock.close()
+            raise
+        self._sock = sock
+        self._wake_r, self._wake_w = os.pipe()
+        # Bound before the scan, so a node added in between is reported rather than missed.
+        with self._cond:
+            self._nodes = dict.fromkeys(find_hidraw_nodes(self.vendor_id, self.product_id))
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="zoneout-hotplug", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread:
+            os.write(self._wake_w, b"\0")
+            if self._thread is not threading.current_thread():
+                self._thread.join()
+            self._thread = None
+        if self._sock:
+            self._sock.close()
+            self._sock = None
+        for fd in (self._wake_r, self._wake_w):
+            if fd >= 0:
+                os.close(fd)
+        self._wake_r = self._wake_w = -1
+
+    def __enter__(self) -> "HotplugWatcher":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    @property
+    def nodes(self) -> List[str]:
+        with self._cond:
+            return list(self._nodes)
+
+    def wait_for_device(self, since: Optional[int] = None, timeout: Optional[float] = None) -> Optional[str]:
+        """Blocks until a node is present, and with `since` until `added` has grown past it.
+
+        Returns the node, or None on timeout or stop().
+        """
+        def ready() -> bool:
+            return not self._running or (bool(self._nodes) and (since is None or self.added > since))
+
+        with self._cond:
+            if not self._cond.wait_for(ready, timeout) or not self._running:
+                return None
+            return next(iter(self._nodes))
+
+    def reconnect(self, connect: Callable[[], T]) -> T:
+        """Calls `connect` until it stops raising DeviceNotFoundError, retrying each time a node is added."""
+        while True:
+            since = self.added
+            try:
+                return connect()
+            except DeviceNotFoundError:
+                if self.wait_for_device(since) is None:
+                    raise
+
+    def _run(self) -> None:
+        poller = select.poll()
+        poller.register(self._sock, select.POLLIN)
+        poller.register(self._wake_r, select.POLLIN)
+        while self._running:
+            for fd, _ in poller.poll():
+                if fd == self._wake_r:
+                    return
+                try:
+                    message, (sender, _) = self._sock.recvfrom(16384)
+                except OSError:
+                    # ENOBUFS: events were dropped, so rescan rather than trust the tracked set.
+                    self._rescan()
+                    continue
+                # Only the kernel (port 0) may send on the kernel group.
+                if self._group == KERNEL_GROUP and sender != 0:
+                    continue
+                self._handle(parse_uevent(message))
+
+    def _handle(self, event: Dict[str, str]) -> None:
+        if event.get("SUBSYSTEM") != "hidraw" or self._match not in event.get("DEVPATH", ""):
+            return
+        name = event.get("DEVNAME", "")
+        node = name if name.startswith("/") else f"/dev/{name}"
+        action = event.get("ACTION")
+        with self._cond:
+            if action == "add":
+                self._nodes[node] = None
+                self.added += 1
+                self._cond.notify_all()
+                callback: Optional[Callable[[str], Any]] = self.on_connect
+            elif action == "remove" and node in self._nodes:
+                del self._nodes[node]
+                callback = self.on_disconnect
+            else:
+                return
+        if callback is not None:
+            callback(node)
+
+    def _rescan(self) -> None:
+        nodes = dict.fromkeys(find_hidraw_nodes(self.vendor_id, self.product_id))
+        with self._cond:
+            added = [node for node in nodes if node not in self._nodes]
+            removed = [node for node in self._nodes if node not in nodes]
+            self._nodes = nodes
+            self.added += len(added)
+            self._cond.notify_all()
+        for node in removed:
+            if self.on_disconnect is not None:
+                self.on_disconnect(node)
+        for node in added:
+            if self.on_connect is not None:
+                self.on_connect(node)
@@ -0,0 +1,190 @@
+import os
+import threading
+from bisect import bisect_left
+from typing import Any, Dict, List, Mapping, Optional
+
+from . import protocol
+
+
+# Upper bounds (seconds) of the latency histogram buckets; a last bucket takes the rest.
+LATENCY_BUCKETS = (0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+REPORT_NAMES: Dict[int, str] = {
+    protocol.REQ_DEVICE_INFO: 'device_info',
+    protocol.REQ_POWER_STATUS: 'power',
+    protocol.REQ_AUDIO_STATUS: 'audio',
+    protocol.REQ_NC_STATUS: 'nc',
+    protocol.REQ_SYSTEM_STATUS: 'system',
+}
+
+# Counters and their Prometheus help text.
+COUNTERS: Dict[str, str] = {
+    'writes': "Setting packets written.",
+    'report_retries': "Report reads that returned nothing or an unrelated packet.",
+    'discarded_packets': "Responses read but matching no pending request.",
+    'protocol_errors': "ProtocolError raised for a missing report or acknowledgement.",
+}
+
+
+class Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"counts": list(self.counts), "sum": self.sum, "count": self.count}
+
+
+def quantile(histogram: Mapping[str, Any], q: float) -> Optional[float]:
+    """Upper bound of the bucket holding quantile `q` of a Histogram snapshot (inf past the last bound)."""
+    rank = q * histogram["count"]
+    seen = 0
+    for bound, count in zip((*LATENCY_BUCKETS, float("inf")), histogram["counts"]):
+        seen += count
+        if count and seen >= rank:
+            return bound
+    return None
+
+
+class HeadsetMetrics:
+    """Counters and latency histograms of one ZoneHeadset (created with `metrics=True`).
+
+    Reports are timed from request to response and keyed by name (see REPORT_NAMES),
+    writes from the packet to its acknowledgement and keyed by WRITE_MAP setting, and
+    events are counted per type as listen() delivers them. snapshot() returns plain
+    JSON-able data; prometheus_text() renders the Prometheus text exposition format.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters: Dict[str, int] = dict.fromkeys(COUNTERS, 0)
+            self.events: Dict[str, int] = {}
+            self.reports: Dict[str, Histogram] = {}
+            self.writes: Dict[str, Histogram] = {}
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += n
+
+    def count_event(self, event_type: str) -> None:
+        with self._lock:
+            self.events[event_type] = self.events.get(event_type, 0) + 1
+
+    def observe_report(self, cmd_id: int, seconds: float) -> None:
+        name = REPORT_NAMES.get(cmd_id) or hex(cmd_id)
+        with self._lock:
+            histogram = self.reports.get(name)
+            if histogram is None:
+                histogram = self.reports[name] = Histogram()
+            histogram.observe(seconds)
+
+    def observe_write(self, setting_key: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self.writes.get(setting_key)
+            if histogram is None:
+                histogram = self.writes[setting_key] = Histogram()
+            histogram.observe(seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "events": dict(self.events),
+                "reports": {name: h.snapshot() for name, h in self.reports.items()},
+                "writes": {key: h.snapshot() for key, h in self.writes.items()},
+            }
+
+    def prometheus_text(self, labels: Optional[Mapping[str, str]] = None) -> str:
+        return prometheus_text(self.snapshot(), labels)
+
+    def write_textfile(self, path: str, labels: Optional[Mapping[str, str]] = None) -> None:
+        """Atomically replaces `path`, as the node_exporter textfile collector expects."""
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            f.write(self.prometheus_text(labels))
+        os.replace(tmp, path)
+
+
+def _labels(base: str, **extra: str) -> str:
+    parts = [base] if base else []
+    parts.extend(f'{key}="{value}"' for key, value in extra.items())
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _histogram_lines(name: str, help_text: str, histograms: Mapping[str, Mapping[str, Any]],
+                     label: str, base: str) -> List[str]:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for key, histogram in sorted(histograms.items()):
+        cumulative = 0
+        for bound, count in zip((*LATENCY_BUCKETS, "+Inf"), histogram["counts"]):
+            cumulative += count
+            lines.append(f"{name}_bucket{_labels(base, **{label: key}, le=str(bound))} {cumulative}")
+        lines.append(f"{name}_sum{_labels(base, **{label: key})} {histogram['sum']:.6f}")
+        lines.append(f"{name}_count{_labels(base, **{label: key})} {histogram['count']}")
+    return lines
+
+
+def prometheus_text(snapshot: Mapping[str, Any], labels: Optional[Mapping[str, str]] = None) -> str:
+    """Renders a HeadsetMetrics snapshot; `labels` (e.g. the serial number) are added to every sample."""
+    base = ",".join(f'{key}="{value}"' for key, value in (labels or {}).items())
+    lines = _histogram_lines("zoneout_report_latency_seconds", "Report request to response latency.",
+                             snapshot["reports"], "report", base)
+    lines += _histogram_lines("zoneout_write_ack_latency_seconds", "Setting write to acknowledgement latency.",
+                              snapshot["writes"], "key", base)
+    lines += ["# HELP zoneout_events_total Events delivered by listen().", "# TYPE zoneout_events_total counter"]
+    lines += [f"zoneout_events_total{_labels(base, type=name)} {count}"
+              for name, count in sorted(snapshot["events"].items())]
+    for name, help_text in COUNTERS.items():
+        lines += [f"# HELP zoneout_{name}_total {help_text}", f"# TYPE zoneout_{name}_total counter",
+                  f"zoneout_{name}_total{_labels(base)} {snapshot['counters'].get(name, 0)}"]
+    return "\n".join(lines) + "\n"
+
+
+class TextfileExporter:
+    """Rewrites a Prometheus textfile from `metrics` every `interval` seconds, and once more on stop()."""
+
+    def __init__(self, metrics: HeadsetMetrics, path: str, interval: float = 15.0,
+                 labels: Optional[Mapping[str, str]] = None) -> None:
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self.labels = labels
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="zoneout-metrics", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "TextfileExporter":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        while True:
+            self.metrics.write_textfile(self.path, self.labels)
+            if self._stop.wait(self.interval):
+                self.metrics.write_textfile(self.path, self.labels)
+                return
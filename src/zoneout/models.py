@@ -1,6 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from enum import IntEnum, Enum
-from typing import Union
+from typing import Any, ClassVar, Dict, Optional, Tuple, Union
 
 
 class NcMode(IntEnum):
@@ -38,20 +38,76 @@ class EventType(Enum):
     BLUETOOTH = "bluetooth"
 
 
-@dataclass
-class PowerState:
+class _Model:
+    """Base for the frozen, slotted models.
+
+    `interned(*args)` returns a shared instance for recurring values (events, power and
+    Bluetooth states), so long-running monitors do not allocate a new object per packet.
+    """
+
+    __slots__ = ()
+
+    _interned: ClassVar[Dict[Tuple[Any, ...], Any]]
+    _INTERN_LIMIT: ClassVar[int] = 4096
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._interned = {}
+
+    @classmethod
+    def interned(cls, *args: Any) -> Any:
+        instance = cls._interned.get(args)
+        if instance is None:
+            instance = cls(*args)
+            if len(cls._interned) < cls._INTERN_LIMIT:
+                cls._interned[args] = instance
+        return instance
+
+    def __getstate__(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state: Tuple[Any, ...]) -> None:
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
+
+@dataclass(frozen=True)
+class DeviceInfo(_Model):
+    __slots__ = ("serial",)
+
+    serial: str
+
+
+@dataclass(frozen=True)
+class HeadsetInfo(_Model):
+    """A transceiver found by enumeration: its transport path and the headset's serial number."""
+
+    __slots__ = ("path", "serial")
+
+    path: str
+    serial: str
+
+
+@dataclass(frozen=True)
+class PowerState(_Model):
+    __slots__ = ("charging", "battery_level")
+
     charging: bool
     battery_level: int
 
 
-@dataclass
-class BluetoothState:
+@dataclass(frozen=True)
+class BluetoothState(_Model):
+    __slots__ = ("enabled", "connected")
+
     enabled: bool
     connected: bool
 
 
-@dataclass
-class AudioStatus:
+@dataclass(frozen=True)
+class AudioStatus(_Model):
+    __slots__ = ("volume", "balance", "sidetone", "battery_level", "charging")
+
     volume: int
     balance: int
     sidetone: int
@@ -59,16 +115,20 @@ class AudioStatus:
     charging: bool
 
 
-@dataclass
-class NcStatus:
+@dataclass(frozen=True)
+class NcStatus(_Model):
+    __slots__ = ("nc_mode", "mic_muted", "ambient_level", "focus_on_voice")
+
     nc_mode: NcMode
     mic_muted: bool
     ambient_level: int
     focus_on_voice: bool
 
 
-@dataclass
-class SystemStatus:
+@dataclass(frozen=True)
+class SystemStatus(_Model):
+    __slots__ = ("boot_nc", "boot_bt", "bt_state", "auto_off_minutes", "language", "notif_enabled", "mic_connected")
+
     boot_nc: BootNcMode
     boot_bt: BootBtMode
     bt_state: BluetoothState
@@ -78,14 +138,30 @@ class SystemStatus:
     mic_connected: bool
 
 
-@dataclass
-class HeadsetFullStatus:
+@dataclass(frozen=True)
+class HeadsetFullStatus(_Model):
+    __slots__ = ("audio", "nc", "system")
+
     audio: AudioStatus
     nc: NcStatus
     system: SystemStatus
 
 
-@dataclass
-class HeadsetEvent:
+@dataclass(frozen=True)
+class HeadsetEvent(_Model):
+    __slots__ = ("type", "value")
+
     type: EventType
     value: Union[int, bool, BluetoothState, NcMode, PowerState]
+
+
+def changed_fields(old: Optional[Any], new: Any) -> Dict[str, Any]:
+    """Fields of the model `new` whose values differ from `old` (all of them when `old` is None)."""
+    if old is None:
+        return {f.name: getattr(new, f.name) for f in fields(new)}
+    changes = {}
+    for f in fields(new):
+        value = getattr(new, f.name)
+        if getattr(old, f.name) != value:
+            changes[f.name] = value
+    return changes
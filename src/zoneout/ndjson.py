@@ -0,0 +1,111 @@
+import json
+import threading
+import time
+from dataclasses import fields, is_dataclass
+from enum import IntEnum
+from typing import Any, BinaryIO, Dict, List, Optional
+
+from .models import HeadsetEvent
+
+
+def to_json(value: Any) -> Any:
+    """Models as objects of their fields, enum settings by lower-case name, the rest as is."""
+    if is_dataclass(value):
+        return {f.name: to_json(getattr(value, f.name)) for f in fields(value)}
+    if isinstance(value, IntEnum):
+        return value.name.lower()
+    return value
+
+
+class NdjsonEventWriter:
+    """Writes events to a binary stream as one compact JSON object per line:
+
+        {"mono":8123.402117,"time":1760000000.120544,"type":"volume","value":17}
+
+    `mono` is time.monotonic() and `time` the wall clock when the event was received.
+    Lines are buffered and written together once `flush_events` are pending or the
+    oldest has waited `flush_interval` seconds, so a tailed pipe still sees each event
+    promptly when events are sparse; `flush_interval=0` writes every line at once.
+    Events are interned, so each distinct event is serialized only once.
+    """
+
+    _CACHE_LIMIT = 4096
+
+    def __init__(self, stream: BinaryIO, flush_interval: float = 0.1, flush_events: int = 256) -> None:
+        self.stream = stream
+        self.flush_interval = flush_interval
+        self.flush_events = max(1, flush_events)
+        self._fragments: Dict[HeadsetEvent, bytes] = {}
+        self._lines: List[bytes] = []
+        self._deadline = 0.0
+        self._cond = threading.Condition()
+        self._closed = False
+        self._error: Optional[BaseException] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def write(self, event: HeadsetEvent, mono: Optional[float] = None, wall: Optional[float] = None) -> None:
+        fragment = self._fragments.get(event)
+        if fragment is None:
+            fragment = json.dumps({"type": event.type.value, "value": to_json(event.value)},
+                                  separators=(",", ":"))[1:].encode()
+            if len(self._fragments) < self._CACHE_LIMIT:
+                self._fragments[event] = fragment
+        line = b'{"mono":%.6f,"time":%.6f,%s\n' % (
+            time.monotonic() if mono is None else mono, time.time() if wall is None else wall, fragment)
+        with self._cond:
+            if self._error is not None:
+                raise self._error
+            self._lines.append(line)
+            if len(self._lines) >= self.flush_events or self.flush_interval <= 0:
+                self._flush_locked()
+            elif len(self._lines) == 1:
+                self._deadline = time.monotonic() + self.flush_interval
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="zoneout-ndjson", daemon=True)
+                    self._thread.start()
+                self._cond.notify()
+
+    def flush(self) -> None:
+        with self._cond:
+            self._flush_locked()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._cond:
+            if self._error is None:
+                self._flush_locked()
+
+    def __enter__(self) -> "NdjsonEventWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _flush_locked(self) -> None:
+        if self._lines:
+            data = b"".join(self._lines)
+            self._lines.clear()
+            self.stream.write(data)
+        self.stream.flush()
+
+    def _run(self) -> None:
+        with self._cond:
+            while not self._closed:
+                if not self._lines:
+                    self._cond.wait()
+                    continue
+                remaining = self._deadline - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+                try:
+                    self._flush_locked()
+                except OSError as e:
+                    # Reported by the next write(), e.g. BrokenPipeError once the reader exits.
+                    self._error = e
+                    return
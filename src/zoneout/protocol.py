@@ -1,4 +1,6 @@
-from typing import Dict, Tuple, Union
+from typing import Dict, Sequence, Tuple, Union
+
+from .exceptions import ProtocolError
 
 
 VENDOR_ID: int = 0x054c
@@ -22,6 +24,22 @@ WRITE_MAP: Dict[str, Tuple[int, int, Union[int, Tuple[int, ...]], int, int, Dict
     'ambient_sound': (0x10, 0x41, (14, 16), 17, 0xDE, {13: 0x02, 15: 0xFF}),
 }
 
+WRITE_LIMITS: Dict[str, Union[Tuple[int, int], Tuple[Tuple[int, int], ...]]] = {
+    'nc_mode':       (0, 2),
+    'volume':        (0, 30),
+    'balance':       (0, 100),
+    'sidetone':      (0, 10),
+    'auto_off':      (0, 255),
+    'notif_voice':   (0, 1),
+    'voice_lang':    (0, 2),
+    'boot_nc':       (0, 3),
+    'boot_bt':       (0, 2),
+
+    'ambient_sound': ((0, 20), (0, 1)),
+}
+
+REQ_DEVICE_INFO: int = 0x02
+REQ_POWER_STATUS: int = 0x04
 REQ_AUDIO_STATUS: int = 0x06
 REQ_NC_STATUS: int = 0x07
 REQ_SYSTEM_STATUS: int = 0x08
@@ -38,4 +56,81 @@ EVT_BT_STATE: int = 0x61
 LANG_MAP: Dict[int, str] = {0: "English", 1: "Japanese", 2: "Chinese"}
 NC_MODE_MAP: Dict[int, str] = {0: "Off", 1: "Noise Cancelling", 2: "Ambient Sound"}
 BOOT_NC_MAP: Dict[int, str] = {0: "Off", 1: "NC", 2: "Ambient", 3: "Remember Last"}
-BOOT_BT_MAP: Dict[int, str] = {0: "Off", 1: "On", 2: "Remember Last"}
\ No newline at end of file
+BOOT_BT_MAP: Dict[int, str] = {0: "Off", 1: "On", 2: "Remember Last"}
+
+
+def is_event(data) -> bool:
+    """True for unsolicited event packets (as opposed to report responses/acks)."""
+    return len(data) >= 16 and data[2] == 0x04 and data[8] == EVT_CATEGORY
+
+
+def ack_key(data) -> Tuple[int, int]:
+    """(CMD, sequence) of a write acknowledgement; matches the bytes 9/11 of the write it answers."""
+    return data[9], data[11]
+
+
+class WriteEncoder:
+    """A WRITE_MAP entry compiled into a 64-byte packet template.
+
+    Header and spacer bytes are filled in once; encoding only patches the sequence,
+    value and checksum bytes of a buffer created by `new_buffer()`.
+    """
+
+    __slots__ = ("key", "template", "cmd", "val_idx", "chk_idx", "chk_const", "multi")
+
+    def __init__(self, key: str, spec: Tuple[int, int, Union[int, Tuple[int, ...]], int, int, Dict[int, int]]) -> None:
+        type_byte, cmd_byte, val_idx, chk_idx, chk_const, spacers = spec
+        template = bytearray(64)
+        template[0:11] = bytes([
+            REPORT_ID, type_byte, 0x01, 0x00, 0xfc, (type_byte - 4),
+            MAGIC_1, MAGIC_2, 0x41, cmd_byte, 0x02
+        ])
+        for idx, byte_val in spacers.items():
+            template[idx] = byte_val
+
+        self.key = key
+        self.template = bytes(template)
+        self.cmd = cmd_byte
+        self.val_idx = val_idx
+        self.chk_idx = chk_idx
+        self.chk_const = chk_const
+        self.multi = isinstance(val_idx, tuple)
+
+    def new_buffer(self) -> bytearray:
+        return bytearray(self.template)
+
+    def encode_into(self, buf: bytearray, value: Union[int, Sequence[int]], seq: int) -> bytearray:
+        buf[11] = seq
+        if self.multi:
+            if not isinstance(value, (tuple, list)) or len(value) != len(self.val_idx):
+                raise ProtocolError(f"Value mismatch for multi-write key {self.key}")
+            total = 0
+            for idx, v in zip(self.val_idx, value):
+                buf[idx] = v
+                total += v
+        else:
+            buf[self.val_idx] = value
+            total = value
+        buf[self.chk_idx] = (seq + total + self.chk_const) & 0xFF
+        return buf
+
+
+def _build_read_request(cmd_id: int) -> bytes:
+    return bytes([
+        REPORT_ID, 0x0C, 0x01, 0x00, 0xFC, 0x08,
+        MAGIC_1, MAGIC_2, 0x41, cmd_id,
+        0x01, 0x01, 0x00, (cmd_id + 0x9C) & 0xFF
+    ]).ljust(64, b"\x00")
+
+
+WRITE_ENCODERS: Dict[str, WriteEncoder] = {key: WriteEncoder(key, spec) for key, spec in WRITE_MAP.items()}
+
+READ_REQUESTS: Dict[int, bytes] = {
+    cmd_id: _build_read_request(cmd_id)
+    for cmd_id in (REQ_DEVICE_INFO, REQ_POWER_STATUS, REQ_AUDIO_STATUS, REQ_NC_STATUS, REQ_SYSTEM_STATUS)
+}
+
+
+def read_request(cmd_id: int) -> bytes:
+    packet = READ_REQUESTS.get(cmd_id)
+    return packet if packet is not None else _build_read_request(cmd_id)
@@ -0,0 +1,130 @@
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, FrozenSet, Hashable, List, Optional, Tuple
+
+from . import protocol
+from .exceptions import DeviceNotFoundError
+from .metrics import HeadsetMetrics
+
+
+DISCONNECTED = object()
+
+
+class HidReactor:
+    """Single reader thread that owns a HID handle.
+
+    Report responses resolve the futures registered via `expect()` for their CMD byte,
+    write acknowledgements those registered for their (CMD, seq) pair, and event
+    packets are copied to every subscriber queue.
+    """
+
+    def __init__(self, device: Any, poll_ms: int = 100, metrics: Optional[HeadsetMetrics] = None) -> None:
+        """Transports with wakeup() are read without a timeout and woken by stop();
+        others are polled every `poll_ms` so the thread notices stop(). Responses that
+        match nothing are counted in `metrics`, if given."""
+        self.device = device
+        self.poll_ms = poll_ms
+        self.metrics = metrics
+        self.error: Optional[BaseException] = None
+        self._pending: Dict[Hashable, Future] = {}
+        self._subscribers: Dict[queue.Queue, Optional[FrozenSet[int]]] = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="zoneout-reactor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._running = False
+        wakeup = getattr(self.device, "wakeup", None)
+        if wakeup is not None:
+            wakeup()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+        if not self.error:
+            self._fail(DeviceNotFoundError("Device closed"))
+
+    def write(self, data: Any) -> None:
+        if self.error:
+            raise DeviceNotFoundError("Device disconnected") from self.error
+        with self._write_lock:
+            try:
+                self.device.write(data)
+            except OSError as e:
+                raise DeviceNotFoundError("Device disconnected") from e
+
+    def expect(self, key: Hashable) -> Tuple[Future, bool]:
+        """Returns the future for the next packet matching `key` and whether it is newly registered.
+
+        `key` is a report CMD id or an ack (CMD, seq) pair. Concurrent callers asking
+        for the same report share one in-flight request.
+        """
+        with self._lock:
+            if self.error:
+                raise DeviceNotFoundError("Device disconnected") from self.error
+            fut = self._pending.get(key)
+            if fut is not None:
+                return fut, False
+            fut = self._pending[key] = Future()
+            return fut, True
+
+    def discard(self, key: Hashable, fut: Future) -> None:
+        with self._lock:
+            if self._pending.get(key) is fut:
+                del self._pending[key]
+
+    def subscribe(self, cmds: Optional[FrozenSet[int]] = None) -> queue.Queue:
+        """Returns a queue receiving raw event packets, limited to the event CMD bytes in `cmds`."""
+        q: queue.Queue = queue.Queue()
+        with self._lock:
+            if self.error:
+                q.put(DISCONNECTED)
+            self._subscribers[q] = cmds
+        return q
+
+    def unsubscribe(self, q: queue.Queue) -> None:
+        with self._lock:
+            self._subscribers.pop(q, None)
+
+    def _run(self) -> None:
+        timeout_ms = -1 if hasattr(self.device, "wakeup") else self.poll_ms
+        while self._running:
+            try:
+                data = self.device.read(64, timeout_ms=timeout_ms)
+            except Exception as e:
+                self._fail(e)
+                return
+            if data:
+                self._dispatch(data)
+
+    def _dispatch(self, data: List[int]) -> None:
+        if protocol.is_event(data):
+            with self._lock:
+                subscribers = list(self._subscribers.items())
+            cmd = data[9]
+            for q, cmds in subscribers:
+                if cmds is None or cmd in cmds:
+                    q.put(data)
+        elif len(data) >= 64:
+            with self._lock:
+                fut = self._pending.pop(protocol.ack_key(data), None) or self._pending.pop(data[9], None)
+            if fut is not None:
+                fut.set_result(data)
+            elif self.metrics is not None:
+                self.metrics.count('discarded_packets')
+
+    def _fail(self, error: BaseException) -> None:
+        with self._lock:
+            self.error = error
+            pending, self._pending = self._pending, {}
+            subscribers = list(self._subscribers)
+        for fut in pending.values():
+            fut.set_exception(DeviceNotFoundError("Device disconnected"))
+        for q in subscribers:
+            q.put(DISCONNECTED)
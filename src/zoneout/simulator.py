@@ -0,0 +1,296 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from . import protocol
+from .decoders import EVENT_LAYOUTS, REPORT_LAYOUTS, SERIAL_OFFSET
+
+
+DEFAULT_STATE: Dict[str, Any] = {
+    'charging': False,
+    'battery_level': 80,
+    'volume': 15,
+    'balance': 50,
+    'sidetone': 0,
+    'nc_mode': 1,
+    'mic_muted': False,
+    'ambient_level': 10,
+    'focus_on_voice': False,
+    'boot_nc': 3,
+    'boot_bt': 2,
+    'bt_enabled': True,
+    'bt_connected': False,
+    'auto_off_minutes': 30,
+    'language': 0,
+    'notif_enabled': True,
+    'mic_connected': True,
+}
+
+# Raw byte for state fields whose encoding is not int(value) (see SPECS.md).
+RAW_ENCODERS: Dict[str, Callable[[Any], int]] = {
+    'notif_enabled': lambda on: 1 if on else 2,
+    'mic_connected': lambda connected: 0 if connected else 1,
+}
+
+# State fields written by each WRITE_MAP key, in value order.
+WRITE_FIELDS: Dict[str, Tuple[str, ...]] = {
+    'nc_mode': ('nc_mode',),
+    'volume': ('volume',),
+    'balance': ('balance',),
+    'sidetone': ('sidetone',),
+    'auto_off': ('auto_off_minutes',),
+    'notif_voice': ('notif_enabled',),
+    'voice_lang': ('language',),
+    'boot_nc': ('boot_nc',),
+    'boot_bt': ('boot_bt',),
+    'ambient_sound': ('ambient_level', 'focus_on_voice'),
+}
+
+_EVENT_ALIASES: Dict[str, str] = {'enabled': 'bt_enabled', 'connected': 'bt_connected'}
+
+# (state field, byte offset) of every report and event payload, from the decoder layouts.
+REPORT_BYTES: Dict[int, Tuple[Tuple[str, int], ...]] = {
+    cmd_id: tuple((name, offset) for name, offset, _, _ in fields)
+    for cmd_id, (_, fields) in REPORT_LAYOUTS.items()
+}
+EVENT_BYTES: Dict[int, Tuple[Tuple[str, int], ...]] = {
+    cmd_id: tuple((_EVENT_ALIASES.get(name, name), offset) for name, offset, _, _ in fields)
+    for cmd_id, (_, _, fields) in EVENT_LAYOUTS.items()
+}
+FIELD_EVENTS: Dict[str, int] = {name: cmd_id for cmd_id, layout in EVENT_BYTES.items() for name, _ in layout}
+
+
+def _raw(name: str, value: Any) -> int:
+    encode = RAW_ENCODERS.get(name)
+    return encode(value) if encode is not None else int(value)
+
+
+class SimulatedHeadset:
+    """In-process stand-in for the H9 II that speaks its HID protocol.
+
+    Implements the transport API ZoneHeadset uses (open, read, write, set_nonblocking,
+    close and wakeup) on top of a `state` dict. Read requests for 0x04/0x06/0x07/0x08
+    are answered from the state and 0x02 with `serial`; WRITE_MAP writes are checksum-verified, applied and
+    acknowledged. Events are emitted for change() and at random, `event_rate` times per
+    second.
+
+    Every packet the device sends arrives after `latency` plus up to `jitter` seconds, is
+    lost with probability `drop_rate`, and may be preceded by a copy of an earlier
+    response (`stale_rate`) or by a response nobody asked for (`unsolicited_rate`).
+    `seed` makes those choices reproducible; `stats` counts what happened.
+    """
+
+    name = "simulator"
+
+    def __init__(self, latency: float = 0.001, jitter: float = 0.0, drop_rate: float = 0.0,
+                 stale_rate: float = 0.0, unsolicited_rate: float = 0.0, event_rate: float = 0.0,
+                 seed: Optional[int] = None, state: Optional[Dict[str, Any]] = None,
+                 serial: str = "SIM0000001") -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.drop_rate = drop_rate
+        self.stale_rate = stale_rate
+        self.unsolicited_rate = unsolicited_rate
+        self.event_rate = event_rate
+        self.serial = serial
+        self.state: Dict[str, Any] = {**DEFAULT_STATE, **(state or {})}
+        self.stats: Dict[str, int] = dict.fromkeys(
+            ("requests", "writes", "bad_checksum", "sent", "dropped", "stale", "unsolicited", "events"), 0
+        )
+        self._rng = random.Random(seed)
+        self._queue: List[Tuple[float, int, bytes]] = []
+        self._order = itertools.count()
+        self._history: List[bytes] = []
+        self._cond = threading.Condition()
+        self._nonblocking = False
+        self._opened = False
+        self._unplugged = False
+        self._woken = False
+        self._next_event = float("inf")
+
+    def open(self, vendor_id: Optional[int] = None, product_id: Optional[int] = None) -> None:
+        if self._unplugged:
+            raise OSError("Simulated headset is unplugged")
+        with self._cond:
+            self._opened = True
+            self._queue.clear()
+            self._next_event = self._event_due(time.monotonic())
+
+    def close(self) -> None:
+        with self._cond:
+            self._opened = False
+            self._cond.notify_all()
+
+    def set_nonblocking(self, enabled: int) -> None:
+        self._nonblocking = bool(enabled)
+
+    def unplug(self) -> None:
+        """Makes every further read and write fail, like a removed transceiver."""
+        with self._cond:
+            self._unplugged = True
+            self._cond.notify_all()
+
+    def plug(self) -> None:
+        """Reverses unplug(); the headset can be opened again."""
+        with self._cond:
+            self._unplugged = False
+
+    def wakeup(self) -> None:
+        with self._cond:
+            self._woken = True
+            self._cond.notify_all()
+
+    def clear_wakeup(self) -> None:
+        with self._cond:
+            self._woken = False
+
+    def change(self, **fields: Any) -> None:
+        """Changes state as the headset's own controls would, emitting the matching events."""
+        with self._cond:
+            self.state.update(fields)
+            now = time.monotonic()
+            for cmd_id in dict.fromkeys(FIELD_EVENTS[name] for name in fields if name in FIELD_EVENTS):
+                self._send(self._event_packet(cmd_id), now)
+
+    def write(self, data: Any) -> int:
+        data = bytes(data)
+        with self._cond:
+            self._check_open()
+            now = time.monotonic()
+            mode = data[10]
+            if mode == 0x01:
+                self.stats["requests"] += 1
+                cmd_id = data[9]
+                known = cmd_id in REPORT_BYTES or cmd_id == protocol.REQ_DEVICE_INFO
+                if known and data[13] == (cmd_id + 0x9C) & 0xFF:
+                    self._send(self._report_packet(cmd_id), now)
+            elif mode == 0x02:
+                self.stats["writes"] += 1
+                key = self._match_write(data)
+                if key is None:
+                    self.stats["bad_checksum"] += 1
+                else:
+                    self._apply_write(key, data)
+                    self._send(self._header(data[9], 0x02, data[11]), now)
+        return len(data)
+
+    def read(self, size: int, timeout_ms: int = 0) -> List[int]:
+        """Next due packet as a list of ints; [] on timeout. Timeouts follow hidapi."""
+        if timeout_ms > 0:
+            deadline: Optional[float] = time.monotonic() + timeout_ms / 1000
+        elif timeout_ms == 0 and self._nonblocking:
+            deadline = time.monotonic()
+        else:
+            deadline = None
+
+        with self._cond:
+            while True:
+                self._check_open()
+                now = time.monotonic()
+                while self._next_event <= now:
+                    self._send(self._random_event(), self._next_event)
+                    self._next_event = self._event_due(self._next_event)
+                if self._queue and self._queue[0][0] <= now:
+                    return list(heapq.heappop(self._queue)[2][:size])
+                if self._woken or (deadline is not None and now >= deadline):
+                    self._woken = False
+                    return []
+                wake_at = min(self._queue[0][0] if self._queue else float("inf"), self._next_event,
+                              deadline if deadline is not None else float("inf"))
+                self._cond.wait(None if wake_at == float("inf") else wake_at - now)
+
+    def _check_open(self) -> None:
+        if self._unplugged:
+            raise OSError("Simulated headset is unplugged")
+        if not self._opened:
+            raise OSError("Simulated headset is not open")
+
+    def _event_due(self, now: float) -> float:
+        return now + self._rng.expovariate(self.event_rate) if self.event_rate > 0 else float("inf")
+
+    def _send(self, packet: bytes, now: float) -> None:
+        rng = self._rng
+        if self._history and rng.random() < self.stale_rate:
+            self.stats["stale"] += 1
+            self._enqueue(rng.choice(self._history), now)
+        if rng.random() < self.unsolicited_rate:
+            self.stats["unsolicited"] += 1
+            self._enqueue(self._header(rng.choice((0x01, 0x03, 0x09)), 0x01, 0x01), now)
+        if rng.random() < self.drop_rate:
+            self.stats["dropped"] += 1
+            return
+        self._enqueue(packet, now)
+        if packet[2] != 0x04:
+            self._history = self._history[-15:] + [packet]
+
+    def _enqueue(self, packet: bytes, now: float) -> None:
+        due = now + self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        heapq.heappush(self._queue, (due, next(self._order), packet))
+        self.stats["sent"] += 1
+        self._cond.notify_all()
+
+    @staticmethod
+    def _header(cmd_id: int, mode: int, seq: int) -> bytes:
+        return bytes([
+            protocol.REPORT_ID, 0x0C, 0x01, 0x00, 0xFC, 0x08,
+            protocol.MAGIC_1, protocol.MAGIC_2, 0x41, cmd_id, mode, seq
+        ]).ljust(64, b"\x00")
+
+    def _report_packet(self, cmd_id: int) -> bytes:
+        packet = bytearray(self._header(cmd_id, 0x01, 0x01))
+        if cmd_id == protocol.REQ_DEVICE_INFO:
+            serial = self.serial.encode("ascii")[:64 - SERIAL_OFFSET - 1]
+            packet[SERIAL_OFFSET:SERIAL_OFFSET + len(serial)] = serial
+            return bytes(packet)
+        for name, offset in REPORT_BYTES[cmd_id]:
+            packet[offset] = _raw(name, self.state[name])
+        return bytes(packet)
+
+    def _event_packet(self, cmd_id: int) -> bytes:
+        packet = bytearray(64)
+        packet[0:11] = bytes([
+            protocol.REPORT_ID, 0x0E, 0x04, 0xFF, 0x0A, 0x00,
+            protocol.MAGIC_1, protocol.MAGIC_2, protocol.EVT_CATEGORY, cmd_id, 0xA0
+        ])
+        for name, offset in EVENT_BYTES[cmd_id]:
+            packet[offset] = _raw(name, self.state[name])
+        self.stats["events"] += 1
+        return bytes(packet)
+
+    def _match_write(self, data: bytes) -> Optional[str]:
+        for key, encoder in protocol.WRITE_ENCODERS.items():
+            if encoder.cmd != data[9] or data[1] != encoder.template[1]:
+                continue
+            val_idx = encoder.val_idx if encoder.multi else (encoder.val_idx,)
+            patched = {11, encoder.chk_idx, *val_idx}
+            if any(data[i] != encoder.template[i] for i in range(len(encoder.template)) if i not in patched):
+                continue
+            if data[encoder.chk_idx] == (data[11] + sum(data[i] for i in val_idx) + encoder.chk_const) & 0xFF:
+                return key
+        return None
+
+    def _apply_write(self, key: str, data: bytes) -> None:
+        encoder = protocol.WRITE_ENCODERS[key]
+        val_idx = encoder.val_idx if encoder.multi else (encoder.val_idx,)
+        for name, idx in zip(WRITE_FIELDS[key], val_idx):
+            current = self.state[name]
+            self.state[name] = bool(data[idx]) if isinstance(current, bool) else data[idx]
+
+    def _random_event(self) -> bytes:
+        rng = self._rng
+        state = self.state
+        name = rng.choice(tuple(FIELD_EVENTS))
+        if name == 'volume':
+            state[name] = max(0, min(30, state[name] + rng.choice((-1, 1))))
+        elif name == 'balance':
+            state[name] = max(0, min(100, state[name] + rng.choice((-5, 5))))
+        elif name == 'battery_level':
+            state[name] = max(0, min(100, state[name] + (1 if state['charging'] else -1)))
+        elif name == 'nc_mode':
+            state[name] = (state[name] + 1) % 3
+        else:
+            state[name] = not state[name]
+        return self._event_packet(FIELD_EVENTS[name])
@@ -0,0 +1,220 @@
+import struct
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, NamedTuple, Optional, Sequence, Union
+
+from . import protocol
+
+
+OUT = 0
+IN = 1
+
+TRACE_MAGIC = b"ZOTRACE1"
+# monotonic time, direction, packet length, packet (zero-padded to 64 bytes).
+RECORD = struct.Struct("<dBB64s")
+
+
+class TraceRecord(NamedTuple):
+    time: float
+    direction: int
+    data: bytes
+
+
+class PacketTrace:
+    """Fixed-size ring of the last `capacity` packets written to and read from a device.
+
+    The buffer is allocated upfront and each packet is packed into its slot, so
+    recording allocates nothing per packet; once full, the oldest records are
+    overwritten (`dropped` counts them). dump() writes a trace file that load_trace()
+    and ReplayTransport read back.
+    """
+
+    def __init__(self, capacity: int = 4096) -> None:
+        self.capacity = capacity
+        self._buf = bytearray(capacity * RECORD.size)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    @property
+    def dropped(self) -> int:
+        return max(0, self._count - self.capacity)
+
+    def record(self, direction: int, data: Any, timestamp: Optional[float] = None) -> None:
+        packet = data if isinstance(data, (bytes, bytearray, memoryview)) else bytes(data)
+        with self._lock:
+            offset = self._count % self.capacity * RECORD.size
+            RECORD.pack_into(self._buf, offset, time.monotonic() if timestamp is None else timestamp,
+                             direction, len(packet), packet)
+            self._count += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._count = 0
+
+    def raw(self) -> bytes:
+        """The records oldest first, in trace file layout."""
+        with self._lock:
+            if self._count <= self.capacity:
+                return bytes(self._buf[:self._count * RECORD.size])
+            split = self._count % self.capacity * RECORD.size
+            return bytes(self._buf[split:] + self._buf[:split])
+
+    def records(self) -> List[TraceRecord]:
+        return _parse(self.raw())
+
+    def dump(self, path: str) -> None:
+        with open(path, "wb") as f:
+            f.write(TRACE_MAGIC)
+            f.write(self.raw())
+
+
+def _parse(raw: bytes) -> List[TraceRecord]:
+    return [TraceRecord(timestamp, direction, packet[:length])
+            for timestamp, direction, length, packet in RECORD.iter_unpack(raw)]
+
+
+def load_trace(path: str) -> List[TraceRecord]:
+    with open(path, "rb") as f:
+        raw = f.read()
+    if not raw.startswith(TRACE_MAGIC) or (len(raw) - len(TRACE_MAGIC)) % RECORD.size:
+        raise ValueError(f"{path} is not a zoneout packet trace")
+    return _parse(raw[len(TRACE_MAGIC):])
+
+
+class TracingTransport:
+    """Wraps a transport, recording every packet written and read into `trace`.
+
+    Other attributes (wakeup, fileno, device_path, ...) are those of the wrapped transport.
+    """
+
+    def __init__(self, inner: Any, trace: PacketTrace) -> None:
+        self.inner = inner
+        self.trace = trace
+
+    def open(self) -> None:
+        self.inner.open()
+
+    def close(self) -> None:
+        self.inner.close()
+
+    def set_nonblocking(self, enabled: int) -> None:
+        self.inner.set_nonblocking(enabled)
+
+    def read(self, size: int, timeout_ms: int = 0) -> Any:
+        data = self.inner.read(size, timeout_ms)
+        if data:
+            self.trace.record(IN, data)
+        return data
+
+    def write(self, data: Any) -> int:
+        self.trace.record(OUT, data)
+        return self.inner.write(data)
+
+    def __getattr__(self, name: str) -> Any:
+        # readinto() would bypass the trace; readers fall back to read().
+        if name == "readinto":
+            raise AttributeError(name)
+        return getattr(self.inner, name)
+
+
+class ReplayTransport:
+    """Plays a recorded trace back as a device, without hardware.
+
+    Events are delivered on the recorded timeline, scaled by `speed` (None replays as
+    fast as they are read). Report responses and write acknowledgements are held back
+    until a request with the same CMD byte is written, and then answered in recorded
+    order, with the sequence number of the new write patched in.
+
+    With `stop_at_end`, reads raise OSError once the last event has been delivered and no
+    answer is queued, which ends listen() as a disconnect (DeviceNotFoundError). Without
+    it, the replay then behaves like an idle device that still answers recorded requests.
+    """
+
+    name = "replay"
+
+    def __init__(self, trace: Union[str, PacketTrace, Sequence[TraceRecord]], speed: Optional[float] = 1.0,
+                 stop_at_end: bool = True) -> None:
+        if isinstance(trace, str):
+            records = load_trace(trace)
+        elif isinstance(trace, PacketTrace):
+            records = trace.records()
+        else:
+            records = list(trace)
+        incoming = [record for record in records if record.direction == IN]
+        self.speed = speed
+        self.stop_at_end = stop_at_end
+        self._events = [record for record in incoming if protocol.is_event(record.data)]
+        self._responses: Dict[int, Deque[bytes]] = {}
+        for record in incoming:
+            if not protocol.is_event(record.data) and len(record.data) >= 12:
+                self._responses.setdefault(record.data[9], deque()).append(record.data)
+        self._answers: Deque[bytes] = deque()
+        self._next = 0
+        self._origin = self._events[0].time if self._events else 0.0
+        self._start = 0.0
+        self._nonblocking = False
+        self._woken = False
+        self._cond = threading.Condition()
+
+    def open(self) -> None:
+        self._start = time.monotonic()
+
+    def close(self) -> None:
+        self.wakeup()
+
+    def set_nonblocking(self, enabled: int) -> None:
+        self._nonblocking = bool(enabled)
+
+    def wakeup(self) -> None:
+        with self._cond:
+            self._woken = True
+            self._cond.notify_all()
+
+    def clear_wakeup(self) -> None:
+        with self._cond:
+            self._woken = False
+
+    def write(self, data: Any) -> int:
+        data = bytes(data)
+        with self._cond:
+            responses = self._responses.get(data[9])
+            if responses:
+                answer = bytearray(responses.popleft())
+                if data[10] == 0x02:
+                    answer[11] = data[11]
+                self._answers.append(bytes(answer))
+                self._cond.notify_all()
+        return len(data)
+
+    def read(self, size: int, timeout_ms: int = 0) -> List[int]:
+        """Next due packet as a list of ints; [] on timeout. Timeouts follow hidapi."""
+        if timeout_ms > 0:
+            deadline: Optional[float] = time.monotonic() + timeout_ms / 1000
+        elif timeout_ms == 0 and self._nonblocking:
+            deadline = time.monotonic()
+        else:
+            deadline = None
+
+        with self._cond:
+            while True:
+                if self._answers:
+                    return list(self._answers.popleft()[:size])
+                now = time.monotonic()
+                due = float("inf")
+                if self._next < len(self._events):
+                    event = self._events[self._next]
+                    due = self._start + (event.time - self._origin) / self.speed if self.speed else now
+                    if due <= now:
+                        self._next += 1
+                        return list(event.data[:size])
+                elif self.stop_at_end:
+                    raise OSError("End of trace")
+                if self._woken or (deadline is not None and now >= deadline):
+                    self._woken = False
+                    return []
+                wake_at = min(due, deadline if deadline is not None else float("inf"))
+                self._cond.wait(None if wake_at == float("inf") else wake_at - now)
@@ -0,0 +1,216 @@
+import os
+import select
+import sys
+from typing import Any, List, Optional, Tuple, Union
+
+from . import protocol
+
+
+SYSFS_HIDRAW = "/sys/class/hidraw"
+
+
+def find_hidraw_nodes(vendor_id: int = protocol.VENDOR_ID, product_id: int = protocol.PRODUCT_ID) -> List[str]:
+    """Returns the /dev/hidraw* nodes of a device, ordered by sysfs path like hidapi enumerates them."""
+    try:
+        names = os.listdir(SYSFS_HIDRAW)
+    except OSError:
+        return []
+
+    matches = []
+    for name in names:
+        try:
+            with open(os.path.join(SYSFS_HIDRAW, name, "device", "uevent")) as f:
+                uevent = f.read()
+        except OSError:
+            continue
+        for line in uevent.splitlines():
+            if line.startswith("HID_ID="):
+                _, vid, pid = line[len("HID_ID="):].split(":")
+                if int(vid, 16) == vendor_id and int(pid, 16) == product_id:
+                    matches.append((os.path.realpath(os.path.join(SYSFS_HIDRAW, name)), f"/dev/{name}"))
+                break
+    return [node for _, node in sorted(matches)]
+
+
+def find_hidapi_paths(vendor_id: int = protocol.VENDOR_ID, product_id: int = protocol.PRODUCT_ID) -> List[str]:
+    """Returns the hidapi paths of a device, in hidapi's enumeration order."""
+    import hid
+
+    return list(dict.fromkeys(os.fsdecode(info["path"]) for info in hid.enumerate(vendor_id, product_id)))
+
+
+class HidapiTransport:
+    """hidapi backend, the portable default. Opens the first matching device unless `path` is given.
+
+    `device_path` is the path actually opened, which other processes see as well.
+    """
+
+    name = "hidapi"
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path
+        self.device_path: Optional[str] = None
+        self._device: Optional[Any] = None
+
+    def open(self) -> None:
+        import hid
+
+        path = self.path
+        if path is None:
+            paths = find_hidapi_paths()
+            if not paths:
+                raise OSError(f"No hidapi device {protocol.VENDOR_ID:04x}:{protocol.PRODUCT_ID:04x}")
+            path = paths[0]
+        device = hid.device()
+        device.open_path(os.fsencode(path))
+        self._device = device
+        self.device_path = path
+
+    def close(self) -> None:
+        if self._device:
+            self._device.close()
+            self._device = None
+
+    def set_nonblocking(self, enabled: int) -> None:
+        self._device.set_nonblocking(enabled)
+
+    def read(self, size: int, timeout_ms: int = 0) -> List[int]:
+        return self._device.read(size, timeout_ms)
+
+    def write(self, data: Any) -> int:
+        return self._device.write(data)
+
+
+class HidrawTransport:
+    """Linux backend talking to /dev/hidraw directly.
+
+    The node is looked up in sysfs by VID/PID unless `path` is given. Reads wait in
+    poll() on the file descriptor, so an idle reader costs no CPU, and land in a
+    preallocated buffer; wakeup() interrupts a pending read from another thread.
+    """
+
+    name = "hidraw"
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path
+        self.device_path: Optional[str] = None
+        self._fd = -1
+        self._wake_r = -1
+        self._wake_w = -1
+        self._poll: Optional[Any] = None
+        self._nonblocking = False
+        self._buf = memoryview(bytearray(64))
+
+    def open(self) -> None:
+        path = self.path
+        if path is None:
+            nodes = find_hidraw_nodes()
+            if not nodes:
+                raise FileNotFoundError(
+                    f"No hidraw node for {protocol.VENDOR_ID:04x}:{protocol.PRODUCT_ID:04x} in {SYSFS_HIDRAW}"
+                )
+            path = nodes[0]
+        self._fd = os.open(path, os.O_RDWR | os.O_CLOEXEC)
+        self.device_path = path
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        self._poll = select.poll()
+        self._poll.register(self._fd, select.POLLIN)
+        self._poll.register(self._wake_r, select.POLLIN)
+
+    def close(self) -> None:
+        for fd in (self._fd, self._wake_r, self._wake_w):
+            if fd >= 0:
+                os.close(fd)
+        self._fd = self._wake_r = self._wake_w = -1
+        self._poll = None
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def set_nonblocking(self, enabled: int) -> None:
+        self._nonblocking = bool(enabled)
+
+    def readinto(self, buf: Any, timeout_ms: int = 0) -> int:
+        """Reads one report into `buf`; returns 0 on timeout or wakeup.
+
+        Timeouts follow hidapi: a positive value waits that long, -1 waits forever, and 0
+        waits forever unless the transport is non-blocking.
+        """
+        if timeout_ms > 0:
+            timeout: Optional[int] = timeout_ms
+        else:
+            timeout = 0 if timeout_ms == 0 and self._nonblocking else None
+
+        ready = False
+        for fd, _ in self._poll.poll(timeout):
+            if fd == self._fd:
+                ready = True
+            else:
+                self.clear_wakeup()
+        return os.readv(self._fd, [buf]) if ready else 0
+
+    def read(self, size: int, timeout_ms: int = 0) -> bytes:
+        n = self.readinto(self._buf[:size], timeout_ms)
+        return bytes(self._buf[:n])
+
+    def write(self, data: Any) -> int:
+        return os.write(self._fd, data)
+
+    def wakeup(self) -> None:
+        try:
+            os.write(self._wake_w, b"\0")
+        except OSError:
+            pass
+
+    def clear_wakeup(self) -> None:
+        """Discards wakeups no read has consumed, which would otherwise cut the next read short."""
+        try:
+            while os.read(self._wake_r, 64):
+                pass
+        except OSError:
+            pass
+
+
+TRANSPORT_NAMES: Tuple[str, ...] = ("hidapi", "hidraw", "simulator")
+
+
+def transport_name(transport: Optional[str] = None) -> str:
+    """Resolves None (to $ZONEOUT_TRANSPORT, default hidapi) and 'auto' (hidraw when a node
+    is found on Linux, else hidapi) to one of TRANSPORT_NAMES."""
+    if transport is None:
+        transport = os.environ.get("ZONEOUT_TRANSPORT") or HidapiTransport.name
+    if transport == "auto":
+        use_hidraw = sys.platform.startswith("linux") and find_hidraw_nodes()
+        return HidrawTransport.name if use_hidraw else HidapiTransport.name
+    if transport not in TRANSPORT_NAMES:
+        raise ValueError(f"Unknown transport '{transport}' (choose from {', '.join(TRANSPORT_NAMES)}, auto)")
+    return transport
+
+
+def create_transport(transport: Union[str, Any, None] = None, path: Optional[str] = None) -> Any:
+    """Resolves a transport name (see transport_name()) or passes a transport instance through.
+
+    `path` selects one device, as returned by enumerate_paths(); by default the first
+    matching device is opened.
+    """
+    if transport is not None and not isinstance(transport, str):
+        return transport
+    name = transport_name(transport)
+    if name == HidapiTransport.name:
+        return HidapiTransport(path)
+    if name == HidrawTransport.name:
+        return HidrawTransport(path)
+    from .simulator import SimulatedHeadset
+    return SimulatedHeadset()
+
+
+def enumerate_paths(transport: Optional[str] = None) -> List[str]:
+    """Paths of every connected transceiver for the given transport name."""
+    name = transport_name(transport)
+    if name == HidapiTransport.name:
+        return find_hidapi_paths()
+    if name == HidrawTransport.name:
+        return find_hidraw_nodes()
+    return []